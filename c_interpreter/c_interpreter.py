@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import scrolledtext, Toplevel
 import sys
+import struct
+import operator
+from collections import deque
 
 # ==========================================
 # 1. 基盤: メモリと型の定義
@@ -9,44 +12,54 @@ import sys
 INT_SIZE = 4 # int型とポインタのアドレスサイズ
 CHAR_SIZE = 1 # char型のデータサイズ
 
+# int の読み書き用に書式を事前コンパイル (書き込みは 32bit に切り詰め、読み出しは符号付き)
+_INT32 = struct.Struct('<i')
+_UINT32 = struct.Struct('<I')
+
 class Memory:
     def __init__(self):
-        self.heap = {} 
-        self.next_free_address = 1000
+        # 仮想アドレス base 以降を連続した bytearray で保持する (未使用領域は常に 0)
+        self.base = 1000
+        self.buf = bytearray(4096)
+        self.size = 0
+
+    @property
+    def next_free_address(self): return self.base + self.size
 
     def allocate(self, size_in_bytes):
-        addr = self.next_free_address
-        self.next_free_address += size_in_bytes
-            
-        for i in range(size_in_bytes):
-            self.heap[addr + i] = 0
+        addr = self.base + self.size
+        self.size += size_in_bytes
+        # int 読み書きがはみ出しても収まるよう INT_SIZE 分の余白を残し、容量は倍々で拡張
+        need = self.size + INT_SIZE - len(self.buf)
+        if need > 0: self.buf.extend(b'\0' * max(need, len(self.buf)))
         return addr
 
+    def release(self, address):
+        """address 以降を解放する (呼び出しフレームの後入れ先出し解放用)。再確保時に備えて 0 クリアする"""
+        offset = address - self.base
+        self.buf[offset:self.size] = bytes(self.size - offset)
+        self.size = offset
+
     def set_int_value(self, address, value):
-        if address < 1000: raise Exception(f"無効なアドレス ({address}) への書き込み試行")
-        for i in range(INT_SIZE):
-            byte_value = (value >> (i * 8)) & 0xFF
-            self.heap[address + i] = byte_value
+        # 読み出しと同じく確保済み範囲 [base, base + size) だけを書き込み先として認める
+        if not (self.base <= address < self.base + self.size): raise Exception(f"無効なアドレス ({address}) への書き込み試行")
+        offset = address - self.base
+        if offset + INT_SIZE <= self.size: _UINT32.pack_into(self.buf, offset, value & 0xFFFFFFFF)
+        else: self.buf[offset:self.size] = _UINT32.pack(value & 0xFFFFFFFF)[:self.size - offset] # 末尾の char 等: 確保範囲外へはみ出す分は書かず未使用領域を 0 に保つ
 
     def get_int_value(self, address):
-        if address not in self.heap:
+        if not (self.base <= address < self.base + self.size):
             raise Exception(f"無効なアドレス ({address}) または未初期化データへのアクセス")
-        
-        value = 0
-        for i in range(INT_SIZE):
-            byte_value = self.heap.get(address + i, 0)
-            value |= (byte_value << (i * 8))
-        return value
+        return _INT32.unpack_from(self.buf, address - self.base)[0]
 
     def set_byte_value(self, address, byte_value):
-        if address < 1000: raise Exception(f"無効なアドレス ({address}) への書き込み試行")
+        if not (self.base <= address < self.base + self.size): raise Exception(f"無効なアドレス ({address}) への書き込み試行")
         if not (0 <= byte_value <= 255): raise ValueError("バイト値は0-255の範囲である必要があります。")
-        self.heap[address] = byte_value
+        self.buf[address - self.base] = byte_value
 
     def get_byte_value(self, address):
-        if address not in self.heap:
-            return 0 
-        return self.heap[address]
+        if not (self.base <= address < self.base + self.size): raise Exception(f"無効なアドレス ({address}) へのアクセス")
+        return self.buf[address - self.base]
 
 class Symbol:
     def __init__(self, var_type, address): self.type, self.address = var_type, address
@@ -64,12 +77,21 @@ TT_EQ, TT_NEQ, TT_LT, TT_GT = 'EQ', 'NEQ', 'LT', 'GT'
 TT_SEMICOLON, TT_LPAREN, TT_RPAREN, TT_LBRACE, TT_RBRACE, TT_COMMA, TT_KEYWORD, TT_EOF = 'SEMICOLON', 'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE', 'COMMA', 'KEYWORD', 'EOF'
 TT_AMPERSAND, TT_ASTERISK = 'AMPERSAND', 'ASTERISK'
 
+KEYWORDS = frozenset({'int', 'void', 'return', 'print', 'debug', 'if', 'else', 'char'})
+TYPE_KEYWORDS = frozenset({'int', 'void', 'char'})
+SINGLE_CHAR_TOKENS = {
+    '&': TT_AMPERSAND, '*': TT_ASTERISK, '<': TT_LT, '>': TT_GT, '+': TT_PLUS, '-': TT_MINUS,
+    ';': TT_SEMICOLON, '(': TT_LPAREN, ')': TT_RPAREN, '{': TT_LBRACE, '}': TT_RBRACE, ',': TT_COMMA,
+}
+
+MAX_INTERN_LEN = 64 # sys.intern する文字列リテラルの最大長
+
 class Token:
     def __init__(self, type, value=None): self.type, self.value = type, value
     def __repr__(self): return f"Token({self.type}, {self.value})"
 
 class Lexer:
-    def __init__(self, text): self.text, self.pos, self.current_char = text, -1, None; self.advance()
+    def __init__(self, text): self.text, self.pos, self.current_char = text, -1, None; self.advance(); self._dispatch = self._build_dispatch()
     def advance(self): self.pos += 1; self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
     def peek(self):
         peek_pos = self.pos + 1
@@ -83,45 +105,61 @@ class Lexer:
             if self.current_char == '*' and self.peek() == '/': self.advance(); self.advance(); return
             self.advance()
 
+    def _build_dispatch(self):
+        """ASCII 文字コード -> 字句処理メソッドの表を作る (make_tokens の elif 連鎖の代わり)"""
+        table = [None] * 128
+        for code in range(128):
+            c = chr(code)
+            if c.isspace(): table[code] = self._skip_space
+            elif c.isdigit(): table[code] = self._make_number
+            elif c.isalpha() or c == '_': table[code] = self._make_identifier
+        for c, tok_type in SINGLE_CHAR_TOKENS.items():
+            table[ord(c)] = lambda tok_type=tok_type: self._make_single(tok_type)
+        table[ord('"')] = self._make_quoted_string
+        table[ord('/')] = self._make_slash
+        table[ord('=')] = self._make_equals
+        table[ord('!')] = self._make_not_equals
+        return table
+
+    def _fallback_handler(self, c):
+        # 非ASCII文字は従来どおり Unicode の文字種で判定
+        if c.isspace(): return self._skip_space
+        if c.isdigit(): return self._make_number
+        if c.isalpha(): return self._make_identifier
+        return None
+
     def make_tokens(self):
-        tokens = []
+        """トークンを1つずつ生成する (Parser が必要な分だけ先読みする)"""
+        dispatch = self._dispatch
         while self.current_char is not None:
-            if self.current_char.isspace(): self.advance()
-            elif self.current_char.isdigit(): tokens.append(self._make_number())
-            elif self.current_char.isalpha() or self.current_char == '_': tokens.append(self._make_identifier())
-            
-            elif self.current_char == '"':
-                self.advance()
-                tokens.append(self._make_string())
-            
-            elif self.current_char == '/':
-                if self.peek() == '/': self.advance(); self.advance(); self.skip_comment(); continue
-                elif self.peek() == '*': self.advance(); self.advance(); self.skip_multiline_comment(); continue
-                else: tokens.append(Token(TT_DIV)); self.advance()
-            
-            elif self.current_char == '&': tokens.append(Token(TT_AMPERSAND)); self.advance()
-            elif self.current_char == '*': tokens.append(Token(TT_ASTERISK)); self.advance()
-            
-            elif self.current_char == '=':
-                if self.peek() == '=': self.advance(); self.advance(); tokens.append(Token(TT_EQ))
-                else: self.advance(); tokens.append(Token(TT_ASSIGN))
-            elif self.current_char == '!':
-                if self.peek() == '=': self.advance(); self.advance(); tokens.append(Token(TT_NEQ))
-                else: raise Exception("不正な文字: '!'")
-            elif self.current_char == '<': tokens.append(Token(TT_LT)); self.advance()
-            elif self.current_char == '>': tokens.append(Token(TT_GT)); self.advance()
-            elif self.current_char == '+': tokens.append(Token(TT_PLUS)); self.advance()
-            elif self.current_char == '-': tokens.append(Token(TT_MINUS)); self.advance()
-            elif self.current_char == ';': tokens.append(Token(TT_SEMICOLON)); self.advance()
-            elif self.current_char == '(': tokens.append(Token(TT_LPAREN)); self.advance()
-            elif self.current_char == ')': tokens.append(Token(TT_RPAREN)); self.advance()
-            elif self.current_char == '{': tokens.append(Token(TT_LBRACE)); self.advance()
-            elif self.current_char == '}': tokens.append(Token(TT_RBRACE)); self.advance()
-            elif self.current_char == ',': tokens.append(Token(TT_COMMA)); self.advance()
-            else: raise Exception(f"不正な文字: {self.current_char}")
+            code = ord(self.current_char)
+            handler = dispatch[code] if code < 128 else self._fallback_handler(self.current_char)
+            if handler is None: raise Exception(f"不正な文字: {self.current_char}")
+            token = handler()
+            if token is not None: yield token
         
-        tokens.append(Token(TT_EOF))
-        return tokens
+        yield Token(TT_EOF)
+
+    # 各ハンドラはトークンを返す (空白・コメントは None)
+    def _skip_space(self): self.advance()
+    def _make_single(self, tok_type): self.advance(); return Token(tok_type)
+
+    def _make_quoted_string(self):
+        self.advance()
+        return self._make_string()
+
+    def _make_slash(self):
+        if self.peek() == '/': self.advance(); self.advance(); self.skip_comment(); return None
+        elif self.peek() == '*': self.advance(); self.advance(); self.skip_multiline_comment(); return None
+        else: self.advance(); return Token(TT_DIV)
+
+    def _make_equals(self):
+        if self.peek() == '=': self.advance(); self.advance(); return Token(TT_EQ)
+        else: self.advance(); return Token(TT_ASSIGN)
+
+    def _make_not_equals(self):
+        if self.peek() == '=': self.advance(); self.advance(); return Token(TT_NEQ)
+        else: raise Exception("不正な文字: '!'")
 
     def _make_number(self):
         num_str = ''
@@ -129,8 +167,9 @@ class Lexer:
         return Token(TT_INT, int(num_str))
 
     def _make_identifier(self):
-        id_str = ''; KEYWORDS = ['int', 'void', 'return', 'print', 'debug', 'if', 'else', 'char']
+        id_str = ''
         while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'): id_str += self.current_char; self.advance()
+        id_str = sys.intern(id_str) # 識別子はシンボル表のキーになるため intern して同一オブジェクトに揃える
         return Token(TT_KEYWORD, id_str) if id_str in KEYWORDS else Token(TT_ID, id_str)
 
     def _make_string(self):
@@ -143,55 +182,87 @@ class Lexer:
             raise Exception("文字列が閉じられていません。")
         
         self.advance()
+        # 短いリテラルのみ intern (長い文字列は重複が少なく intern 表を肥大化させるだけ)
+        if len(str_val) <= MAX_INTERN_LEN: str_val = sys.intern(str_val)
         return Token(TT_STRING, str_val)
 
 # ==========================================
 # 3. AST & 4. Parser
 # ==========================================
 
-class ASTNode: pass
+# 二項演算子はパース時に演算関数を決めてノードへ保持する (実行時の演算子判定を省く)
+BINARY_OPS = {
+    TT_PLUS: operator.add, TT_MINUS: operator.sub, TT_MUL: operator.mul,
+    TT_DIV: lambda a, b: int(a / b),
+    TT_EQ: lambda a, b: 1 if a == b else 0, TT_NEQ: lambda a, b: 1 if a != b else 0,
+    TT_LT: lambda a, b: 1 if a < b else 0, TT_GT: lambda a, b: 1 if a > b else 0,
+}
+
+# 代入先などの判定用にノード種別を整数タグで持たせる (実行時の isinstance を避ける)
+KIND_VAR, KIND_DEREF, KIND_ADDR, KIND_OTHER = 0, 1, 2, 3
+
+# 各ノードは eval(interp) で自分自身を評価する (型名からのメソッド検索を実行時に行わない)
+class ASTNode:
+    kind = KIND_OTHER
+    def eval(self, i): return i.no_visit_method(self)
 class ProgramNode(ASTNode):
     def __init__(self, nodes): self.nodes = nodes
+    def eval(self, i): return i.visit_ProgramNode(self)
 class VarDeclNode(ASTNode):
     def __init__(self, var_type, name): self.var_type, self.name = var_type, name
+    def eval(self, i): pass # ローカル変数の領域は関数呼び出し時にフレームとして確保済み
 class FunctionDefNode(ASTNode):
     def __init__(self, return_type, name, params, body): self.return_type, self.name, self.params, self.body = return_type, name, params, body
 class FunctionCallNode(ASTNode):
     def __init__(self, name, args): self.name, self.args = name, args
+    def eval(self, i): return i.visit_FunctionCallNode(self)
 class ReturnNode(ASTNode):
     def __init__(self, expr): self.expr = expr
+    def eval(self, i): raise ReturnSignal(self.expr.eval(i))
 class AssignmentNode(ASTNode):
     def __init__(self, target, expr): self.target, self.expr = target, expr
+    def eval(self, i): return i.visit_AssignmentNode(self)
 class BinaryOpNode(ASTNode):
-    def __init__(self, left, op, right): self.left, self.op, self.right = left, op, right
+    def __init__(self, left, op, right): self.left, self.op, self.right = left, op, right; self.fn = BINARY_OPS[op.type]
+    def eval(self, i): return self.fn(self.left.eval(i), self.right.eval(i))
 class NumberNode(ASTNode):
     def __init__(self, value): self.value = value
+    def eval(self, i): return self.value
 class StringNode(ASTNode):
     def __init__(self, value): self.value = value
+    def eval(self, i): return i.string_literals[self.value]
 class VarAccessNode(ASTNode):
+    kind = KIND_VAR
     def __init__(self, name): self.name = name
+    def eval(self, i): return i.visit_VarAccessNode(self)
 class PrintNode(ASTNode):
     def __init__(self, expr): self.expr = expr
-class DebugNode(ASTNode): pass
+    def eval(self, i): return i.visit_PrintNode(self)
+class DebugNode(ASTNode):
+    def eval(self, i): return i.visit_DebugNode(self)
 class IfNode(ASTNode):
     def __init__(self, condition, true_body, false_body=None): self.condition, self.true_body, self.false_body = condition, true_body, false_body
+    def eval(self, i): return i.visit_IfNode(self)
 class UnaryOpNode(ASTNode):
-    def __init__(self, op, operand): self.op, self.operand = op, operand
+    def __init__(self, op, operand):
+        self.op, self.operand = op, operand; self.fn = UNARY_OPS[op.type]
+        self.kind = KIND_DEREF if op.type == TT_ASTERISK else KIND_ADDR
+    def eval(self, i): return self.fn(i, self)
 
 class Parser:
-    def __init__(self, tokens): self.tokens, self.token_idx = tokens, -1; self.advance()
+    def __init__(self, tokens): self.tokens, self.lookahead = iter(tokens), deque(); self.advance()
+    def _next_token(self): return next(self.tokens, None) or Token(TT_EOF)
     def advance(self):
-        self.token_idx += 1
-        if self.token_idx < len(self.tokens): self.current_token = self.tokens[self.token_idx]
-        else: self.current_token = Token(TT_EOF)
-    def peek(self):
-        if self.token_idx + 1 < len(self.tokens): return self.tokens[self.token_idx + 1]
-        return Token(TT_EOF)
+        self.current_token = self.lookahead.popleft() if self.lookahead else self._next_token()
+    def peek(self, offset=1):
+        # 先読みが必要になった分だけトークン列から取り出してバッファする
+        while len(self.lookahead) < offset: self.lookahead.append(self._next_token())
+        return self.lookahead[offset - 1]
 
     def parse(self):
         nodes = []
         while self.current_token.type != TT_EOF:
-            if self.current_token.type == TT_KEYWORD and (self.current_token.value in ('int', 'void', 'char')):
+            if self.current_token.type == TT_KEYWORD and self.current_token.value in TYPE_KEYWORDS:
                 nodes.append(self.top_level_declaration())
             else: raise Exception(f"予期しないトークン: {self.current_token}")
         return ProgramNode(nodes)
@@ -205,7 +276,7 @@ class Parser:
     def top_level_declaration(self):
         full_type = self.get_type_string()
         if self.current_token.type != TT_ID: raise Exception("変数名または関数名が必要です。")
-        if self.tokens[self.token_idx + 1].type == TT_LPAREN:
+        if self.peek().type == TT_LPAREN:
             func_name = self.current_token.value; self.advance(); return self.function_definition_continue(full_type, func_name)
         else:
             var_name = self.current_token.value; self.advance(); return self.var_declaration_continue(full_type, var_name)
@@ -235,7 +306,7 @@ class Parser:
         self.advance(); return body
 
     def statement(self):
-        if self.current_token.type == TT_KEYWORD and (self.current_token.value in ('int', 'void', 'char')):
+        if self.current_token.type == TT_KEYWORD and self.current_token.value in TYPE_KEYWORDS:
             full_type = self.get_type_string(); var_name = self.current_token.value; self.advance(); self.advance(); return VarDeclNode(full_type, var_name)
         
         if self.current_token.type == TT_ID or self.current_token.type == TT_ASTERISK or self.current_token.type == TT_AMPERSAND:
@@ -252,9 +323,9 @@ class Parser:
         raise Exception(f"文エラー: {self.current_token}")
 
     def peek_for_assignment(self):
-        i = self.token_idx
-        while self.tokens[i].type == TT_ASTERISK: i += 1
-        if self.tokens[i].type == TT_ID and self.tokens[i+1].type == TT_ASSIGN: return True
+        i, tok = 0, self.current_token
+        while tok.type == TT_ASTERISK: i += 1; tok = self.peek(i)
+        if tok.type == TT_ID and self.peek(i + 1).type == TT_ASSIGN: return True
         return False
 
     def assignment(self):
@@ -317,15 +388,12 @@ class Interpreter:
         self.functions = {}
         self.global_symtable = {}
         self.string_literals = {}
-        self.call_stack = []
+        self.call_stack = [] # 呼び出し中の関数のフレーム先頭アドレス
         self.output_callback = output_callback
         self.debug_callback = debug_callback 
 
     def log(self, message): self.output_callback(str(message) + "\n")
-    def visit(self, node):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node)
+    def visit(self, node): return node.eval(self)
     def no_visit_method(self, node): raise Exception(f"No visit_{type(node).__name__}")
 
     def _get_size_by_type(self, var_type):
@@ -338,63 +406,134 @@ class Interpreter:
         raise Exception(f"不明な型サイズ: {var_type}")
 
     def _store_string_literal(self, string_value):
+        if len(string_value) <= MAX_INTERN_LEN: string_value = sys.intern(string_value)
         if string_value not in self.string_literals:
-            size = len(string_value) + 1 
-            addr = self.memory.allocate(size_in_bytes=size) 
+            try: data = string_value.encode('latin-1') + b'\0'
+            except UnicodeEncodeError: raise ValueError("バイト値は0-255の範囲である必要があります。")
+            addr = self.memory.allocate(size_in_bytes=len(data)) 
             
-            for i, char in enumerate(string_value):
-                self.memory.set_byte_value(addr + i, ord(char))
-            
-            self.memory.set_byte_value(addr + size - 1, 0)
+            # NUL 終端まで含めて一括コピー
+            offset = addr - self.memory.base
+            self.memory.buf[offset:offset + len(data)] = data
             self.string_literals[string_value] = addr
         
         return self.string_literals[string_value]
 
     def _read_string_from_memory(self, address):
-        if address < 1000: return f"Error: Invalid string address {address}"
-        
-        result = []
-        current_addr = address
+        if address < self.memory.base: return f"Error: Invalid string address {address}"
         
-        while True:
-            try:
-                byte_value = self.memory.get_byte_value(current_addr)
-                if byte_value == 0:
-                    break
-                result.append(chr(byte_value))
-                current_addr += 1
-            except Exception:
-                break
-        return "".join(result)
-
-    def _find_and_store_string_literals_recursive(self, node):
-        """ASTを再帰的に走査し、StringNodeを発見したらメモリに配置する"""
-        if isinstance(node, list):
-            for item in node:
-                self._find_and_store_string_literals_recursive(item)
-            return
-        
-        if isinstance(node, StringNode):
-            self._store_string_literal(node.value)
-            return
-
-        if hasattr(node, '__dict__'):
-            for key, value in node.__dict__.items():
-                if isinstance(value, (ASTNode, list)):
-                    self._find_and_store_string_literals_recursive(value)
+        # NUL 終端の探索とデコードを bytearray 上で一括して行う (終端が無ければバッファ末尾まで)
+        buf, offset = self.memory.buf, address - self.memory.base
+        try: end = buf.index(0, offset)
+        except ValueError: end = len(buf)
+        return buf[offset:end].decode('latin-1')
 
     def _static_analysis_and_allocation(self, node):
         """Phase 1: ASTを走査し、静的領域と文字列リテラルのアドレスを確保"""
         for child in node.nodes:
             if isinstance(child, FunctionDefNode): 
                 self.functions[child.name] = child
-                # 関数内の文字列リテラルをここで確保 (再帰走査)
-                self._find_and_store_string_literals_recursive(child) 
             elif isinstance(child, VarDeclNode): 
-                self._declare_variable(child.name, child.var_type, is_global=True)
+                self.global_symtable[child.name] = self._declare_variable(child.var_type)
             elif isinstance(child, AssignmentNode) and isinstance(child.expr, StringNode):
                 # トップレベルの代入（初期化子代わりの使用を想定）の文字列リテラルを配置
                 self._store_string_literal(child.expr.value) 
+        # 全グローバル変数の確保後に関数本体を解決する (定義順に依存しない)
+        for func_node in self.functions.values():
+            self._resolve_function(func_node)
+
+    def _resolve_function(self, func_node):
+        """関数内の引数・ローカル変数にフレーム内オフセットを割り付け、変数参照をオフセット/グローバルSymbolへ直接結び付ける"""
+        func_node.local_names, func_node.local_types, func_node.local_offsets = [], [], []
+        func_node.frame_size = 0
+        scope = {}
+        for param_node in func_node.params: self._add_local(func_node, scope, param_node.value, 'int')
+        self._resolve(func_node.body, func_node, scope)
+        func_node.compiled = self._compile_body(func_node.body)
+
+    def _add_local(self, func_node, scope, name, var_type):
+        # スロット番号 -> (名前, 型, フレーム先頭からのオフセット)
+        scope[name] = len(func_node.local_names)
+        func_node.local_names.append(name); func_node.local_types.append(var_type); func_node.local_offsets.append(func_node.frame_size)
+        func_node.frame_size += self._get_size_by_type(var_type)
+
+    def _resolve(self, node, func_node, scope):
+        """ASTを再帰的に走査し、文字列リテラルの配置と変数参照の解決を行う"""
+        if isinstance(node, list):
+            for item in node: self._resolve(item, func_node, scope)
+            return
+        
+        if isinstance(node, StringNode):
+            self._store_string_literal(node.value)
+        elif isinstance(node, VarDeclNode):
+            self._add_local(func_node, scope, node.name, node.var_type)
+        elif isinstance(node, VarAccessNode):
+            if node.name in scope:
+                slot = scope[node.name]
+                node.is_global, node.offset, node.var_type = False, func_node.local_offsets[slot], func_node.local_types[slot]
+            elif node.name in self.global_symtable:
+                node.is_global, node.symbol = True, self.global_symtable[node.name]
+                node.var_type = node.symbol.type
+            else: raise Exception(f"未定義変数: {node.name}")
+        elif isinstance(node, PrintNode):
+            self._resolve(node.expr, func_node, scope)
+            node.expr = self._fold_constant(node.expr)
+            # 文字列として出力するかを解析時に確定させる (char* 変数か文字列リテラル)
+            expr = node.expr
+            node.is_string = isinstance(expr, StringNode) or (isinstance(expr, VarAccessNode) and expr.var_type.startswith('char*'))
+        elif isinstance(node, DebugNode):
+            # ブレークポイント時点で宣言済みのローカル変数だけを表示する
+            node.func, node.num_visible_locals = func_node, len(func_node.local_names)
+        else:
+            for key, value in list(node.__dict__.items()):
+                if isinstance(value, ASTNode):
+                    self._resolve(value, func_node, scope)
+                    setattr(node, key, self._fold_constant(value))
+                elif isinstance(value, list):
+                    self._resolve(value, func_node, scope)
+                    value[:] = [self._fold_constant(item) for item in value]
+
+    def _fold_constant(self, node):
+        """両辺が定数の二項演算を解析時に計算し NumberNode に置き換える (子は解決済みなので下から畳み込まれる)"""
+        if isinstance(node, BinaryOpNode) and isinstance(node.left, NumberNode) and isinstance(node.right, NumberNode):
+            try: return NumberNode(node.fn(node.left.value, node.right.value))
+            except ZeroDivisionError: return node # 0除算は実行時にエラーとする
+        return node
+
+    def _compile_body(self, body):
+        """文のリストを一度だけ走査し、実行時にそのまま呼べる step(interp) のリストへ変換する"""
+        steps = []
+        for stmt in body:
+            if isinstance(stmt, VarDeclNode): continue # 領域はフレーム確保時に用意済みなので実行時の処理は無い
+            steps.append(self._compile_statement(stmt))
+        return steps
+
+    def _compile_statement(self, stmt):
+        if isinstance(stmt, AssignmentNode) and stmt.target.kind == KIND_VAR:
+            # 変数への代入は解決済みのアドレス/オフセットを閉包に取り込み、ノードを辿らずに書き込む
+            set_int, expr = self.memory.set_int_value, stmt.expr.eval
+            if stmt.target.is_global:
+                address = stmt.target.symbol.address
+                return lambda i: set_int(address, expr(i))
+            offset = stmt.target.offset
+            return lambda i: set_int(i.call_stack[-1] + offset, expr(i))
+        if isinstance(stmt, IfNode):
+            stmt.cond = self._compile_condition(stmt.condition)
+            stmt.true_steps = self._compile_body(stmt.true_body)
+            stmt.false_steps = self._compile_body(stmt.false_body) if stmt.false_body else []
+        return stmt.eval
+
+    def _compile_condition(self, cond):
+        """if の条件式を cond(interp) に変換する。「変数 比較演算子 定数」は変数読み出しと比較だけの閉包に特化する"""
+        if isinstance(cond, BinaryOpNode) and cond.op.type in (TT_EQ, TT_NEQ, TT_LT, TT_GT) \
+                and isinstance(cond.left, VarAccessNode) and isinstance(cond.right, NumberNode):
+            get_int, op, k = self.memory.get_int_value, cond.fn, cond.right.value
+            if cond.left.is_global:
+                address = cond.left.symbol.address
+                return lambda i: op(get_int(address), k)
+            offset = cond.left.offset
+            return lambda i: op(get_int(i.call_stack[-1] + offset), k)
+        return cond.eval
 
     def visit_ProgramNode(self, node):
         # --- PHASE 1: 静的解析と確保 ---
@@ -408,115 +547,89 @@ class Interpreter:
             self.log("--- Finished ---")
         else: self.log("Error: main関数がありません")
 
-    def _declare_variable(self, name, var_type, is_global=False):
+    def _declare_variable(self, var_type):
+        # 確保した領域は 0 で初期化済みなので明示的なゼロ書き込みは不要
         addr = self.memory.allocate(size_in_bytes=self._get_size_by_type(var_type))
-        symbol = Symbol(var_type, addr)
-        if is_global: self.global_symtable[name] = symbol
-        else: self.call_stack[-1][name] = symbol
-        self.memory.set_int_value(addr, 0)
+        return Symbol(var_type, addr)
 
-    def _get_symbol(self, name):
-        if self.call_stack and name in self.call_stack[-1]: return self.call_stack[-1][name]
-        if name in self.global_symtable: return self.global_symtable[name]
-        raise Exception(f"未定義変数: {name}")
+    def _get_address(self, node):
+        if node.is_global: return node.symbol.address
+        return self.call_stack[-1] + node.offset
 
     def call_function(self, name, arg_values):
         func_node = self.functions.get(name)
         if not func_node: raise Exception(f"未定義関数: {name}")
 
-        new_symtable = {}
         if len(arg_values) != len(func_node.params): raise Exception(f"関数 '{name}' の引数の数が一致しません")
-            
-        for param_node, arg_value in zip(func_node.params, arg_values):
-            param_name = param_node.value
-            addr = self.memory.allocate(size_in_bytes=INT_SIZE)
-            new_symtable[param_name] = Symbol('int', addr) 
-            self.memory.set_int_value(addr, arg_value) 
+        
+        # 引数とローカル変数の領域をフレームとしてまとめて1回で確保する (確保直後は 0 クリア済み)
+        frame_addr = self.memory.allocate(size_in_bytes=func_node.frame_size)
+        buf, frame_offset = self.memory.buf, frame_addr - self.memory.base
+        for offset, arg_value in zip(func_node.local_offsets, arg_values):
+            _UINT32.pack_into(buf, frame_offset + offset, arg_value & 0xFFFFFFFF)
 
-        self.call_stack.append(new_symtable)
+        self.call_stack.append(frame_addr)
         
         try:
-            for stmt in func_node.body: self.visit(stmt)
+            for step in func_node.compiled: step(self)
         except ReturnSignal as ret:
-            self.call_stack.pop(); return ret.value
+            return ret.value
+        finally:
+            # 関数を抜けたらフレーム領域を返却する
+            self.call_stack.pop()
+            self.memory.release(frame_addr)
         
-        self.call_stack.pop()
         return None if func_node.return_type == 'void' else 0
 
     def visit_FunctionCallNode(self, node):
-        arg_values = [self.visit(arg_expr) for arg_expr in node.args]
+        arg_values = [arg_expr.eval(self) for arg_expr in node.args]
         return self.call_function(node.name, arg_values)
 
-    def visit_VarDeclNode(self, node): self._declare_variable(node.name, node.var_type)
-
     def visit_AssignmentNode(self, node):
-        r_value = self.visit(node.expr)
+        r_value = node.expr.eval(self)
 
-        if isinstance(node.target, VarAccessNode):
-            symbol = self._get_symbol(node.target.name)
-            self.memory.set_int_value(symbol.address, r_value)
-        elif isinstance(node.target, UnaryOpNode) and node.target.op.type == TT_ASTERISK:
-            target_address = self.visit(node.target.operand) 
+        kind = node.target.kind
+        if kind == KIND_VAR:
+            self.memory.set_int_value(self._get_address(node.target), r_value)
+        elif kind == KIND_DEREF:
+            target_address = node.target.operand.eval(self) 
             self.memory.set_int_value(target_address, r_value)
         else:
             raise Exception("代入の左辺値が不正です。")
 
     def visit_VarAccessNode(self, node):
-        symbol = self._get_symbol(node.name)
-        return self.memory.get_int_value(symbol.address)
-    
-    def visit_UnaryOpNode(self, node):
-        if node.op.type == TT_AMPERSAND:
-            if not isinstance(node.operand, VarAccessNode): raise Exception("& 演算子は変数にのみ適用可能です。")
-            symbol = self._get_symbol(node.operand.name)
-            return symbol.address
-        elif node.op.type == TT_ASTERISK:
-            address_to_dereference = self.visit(node.operand) 
-            return self.memory.get_int_value(address_to_dereference)
-        raise Exception(f"不明な単項演算子: {node.op.type}")
-
-    def visit_NumberNode(self, node): return node.value
-    
-    def visit_StringNode(self, node):
-        return self.string_literals[node.value]
+        return self.memory.get_int_value(self._get_address(node))
     
+    def _eval_address_of(self, node):
+        if node.operand.kind != KIND_VAR: raise Exception("& 演算子は変数にのみ適用可能です。")
+        return self._get_address(node.operand)
+
+    def _eval_dereference(self, node):
+        return self.memory.get_int_value(node.operand.eval(self))
+
     def visit_DebugNode(self, node):
         self.log(">>> Breakpoint <<<")
-        self.debug_callback(self.global_symtable, self.call_stack[-1] if self.call_stack else {})
+        local_symtable = {}
+        if self.call_stack:
+            func_node, frame_addr, n = node.func, self.call_stack[-1], node.num_visible_locals
+            for name, var_type, offset in zip(func_node.local_names[:n], func_node.local_types[:n], func_node.local_offsets[:n]):
+                local_symtable[name] = Symbol(var_type, frame_addr + offset)
+        self.debug_callback(self.global_symtable, local_symtable)
         
     def visit_PrintNode(self, node):
-        output_value = self.visit(node.expr)
-
-        is_string_output = isinstance(node.expr, StringNode)
-        if isinstance(node.expr, VarAccessNode):
-            symbol = self._get_symbol(node.expr.name)
-            if symbol.type.startswith('char*'):
-                is_string_output = True
+        output_value = node.expr.eval(self)
 
-        if is_string_output:
+        if node.is_string:
             string_output = self._read_string_from_memory(output_value)
             self.log(f"[STRING OUTPUT] {string_output}")
         else:
             self.log(f"[INT OUTPUT] {output_value}")
             
-    def visit_ReturnNode(self, node):
-        raise ReturnSignal(self.visit(node.expr))
-    
-    def visit_BinaryOpNode(self, node):
-        left = self.visit(node.left); right = self.visit(node.right)
-        if node.op.type == TT_PLUS: return left + right
-        elif node.op.type == TT_MINUS: return left - right
-        elif node.op.type == TT_MUL: return left * right
-        elif node.op.type == TT_DIV: return int(left / right)
-        elif node.op.type == TT_EQ: return 1 if left == right else 0
-        elif node.op.type == TT_NEQ: return 1 if left != right else 0
-        elif node.op.type == TT_LT: return 1 if left < right else 0
-        elif node.op.type == TT_GT: return 1 if left > right else 0
     def visit_IfNode(self, node):
-        if self.visit(node.condition) != 0:
-            for stmt in node.true_body: self.visit(stmt)
-        elif node.false_body:
-            for stmt in node.false_body: self.visit(stmt)
+        for step in (node.true_steps if node.cond(self) != 0 else node.false_steps): step(self)
+
+# 単項演算子もパース時に評価関数を決める (Interpreter のメソッドを (interp, node) で呼ぶ)
+UNARY_OPS = {TT_AMPERSAND: Interpreter._eval_address_of, TT_ASTERISK: Interpreter._eval_dereference}
 
 # ==========================================
 # 6. GUI アプリケーション
@@ -607,7 +720,7 @@ void main() {
             return
 
         interpreter = self.root.interpreter_instance
-        memory_data = interpreter.memory.heap
+        memory = interpreter.memory
         
         viewer = Toplevel(self.root)
         viewer.title(f"Memory Viewer (Heap) - {INT_SIZE} Bytes/int")
@@ -618,25 +731,21 @@ void main() {
         memory_text = scrolledtext.ScrolledText(viewer, height=20, font=("Consolas", 10), bg="#f5f5f5")
         memory_text.pack(padx=10, pady=5, fill="both", expand=True)
         
-        sorted_addresses = sorted(memory_data.keys())
-        
-        if not sorted_addresses:
+        if not memory.size:
             memory_text.insert(tk.END, "メモリはまだ割り当てられていません。")
             return
 
-        memory_text.insert(tk.END, f"Next Free Address: {interpreter.memory.next_free_address}\n")
+        memory_text.insert(tk.END, f"Next Free Address: {memory.next_free_address}\n")
         memory_text.insert(tk.END, "="*50 + "\n")
 
         output_lines = []
-        for addr in sorted_addresses:
-            byte_value = memory_data[addr]
-            
+        for addr, byte_value in enumerate(memory.buf[:memory.size], start=memory.base):
             hex_value = f"0x{byte_value:02x}"
             char_repr = repr(chr(byte_value)) if 32 <= byte_value <= 126 else '..'
             
             line = f"[{addr:04d}]: {byte_value:03d} ({hex_value}) | Char: {char_repr}"
             
-            if (addr - 1000) % INT_SIZE == 0:
+            if (addr - memory.base) % INT_SIZE == 0:
                  line = f"--- INT START --- " + line
 
             output_lines.append(line)
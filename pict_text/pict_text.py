@@ -2,6 +2,11 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import threading
+import queue
+import hashlib
+import sqlite3
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image, ImageTk
 from datetime import datetime
 
@@ -11,12 +16,75 @@ from google.genai.errors import APIError
 
 # --- 設定 ---
 MODEL_NAME = "gemini-2.5-flash"
+PROMPT_TEXT = "テキストに変換してください。"
 IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# 拡張子の判定用 (ファイル名全体ではなく拡張子部分だけを小文字にして照合する)
+_IMG_SUFFIXES = frozenset(IMAGE_EXTENSIONS)
 OUTPUT_FILENAME_BASE = "gemini_results"
 # 💡 【変更点 1】APIキーのパスを保持するための設定ファイル
 KEY_CONFIG_FILE = "key_path_config.txt" 
+# 一括処理でGeminiへ同時に送るリクエスト数 (RPM制限を超えない程度に抑える)
+DEFAULT_WORKERS = 4
+MAX_WORKERS = 16
+# リストボックスへ一度に追加するファイル名の数 (末尾付近までスクロールしたら次を追加する)
+LISTBOX_PAGE_SIZE = 500
+# 💡 Geminiの応答を再起動後も再利用するための永続キャッシュ
+CACHE_DB_FILE = "gemini_cache.sqlite"
+PROMPT_HASH = hashlib.sha256(PROMPT_TEXT.encode('utf-8')).hexdigest()[:16]
+# Geminiに送る画像の長辺の上限 (これより大きい画像はサーバー側でも縮小される)
+GEMINI_MAX_SIDE = 1568
 # -------------
 
+# APIキー -> genai.Client。同じキーを選び直してもクライアントを作り直さない
+_CLIENT_CACHE = {}
+
+@lru_cache(maxsize=8)
+def _load_for_gemini(image_path, mtime):
+    # mtime をキーに含めることで、ファイルが更新されたら読み直す
+    img = Image.open(image_path)
+    # JPEGはデコード時に 1/2, 1/4, 1/8 へ縮小させてから、残りを thumbnail で縮める
+    img.draft('RGB', (GEMINI_MAX_SIDE, GEMINI_MAX_SIDE))
+    img.thumbnail((GEMINI_MAX_SIDE, GEMINI_MAX_SIDE), Image.Resampling.LANCZOS)
+    return img
+
+def _prepare_for_gemini(image_path):
+    """Geminiに送信する画像を読み込み、長辺 GEMINI_MAX_SIDE 以下に縮小して返す"""
+    return _load_for_gemini(image_path, os.path.getmtime(image_path))
+
+
+class CacheStore:
+    """画像の内容ハッシュ + モデル + プロンプトをキーに、Geminiの応答をSQLiteへ保存する"""
+    def __init__(self, path):
+        # ワーカースレッドからも使うため、1つの接続をロックで直列化して共有する
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+        except sqlite3.Error:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        with self._lock:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)")
+            self._conn.commit()
+
+    @staticmethod
+    def build_key(image_path):
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}:{MODEL_NAME}:{PROMPT_HASH}"
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, response):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                               (key, response, int(datetime.now().timestamp())))
+            self._conn.commit()
+
+
 class GeminiImageProcessorApp:
     def __init__(self, master):
         self.master = master
@@ -26,10 +94,31 @@ class GeminiImageProcessorApp:
         self.current_folder = ""
         self.current_image_path = None
         self.file_paths = []
+        # リストボックスに表示するファイル名と、そのうち実際に挿入済みの件数
+        self._file_names = []
+        self._listed = 0
         self.is_processing = False 
         self.response_cache = {}
+        self.cache_store = CacheStore(CACHE_DB_FILE)
         # 💡 APIキーファイルのパスを保持する変数
         self.api_key_path = "" 
+        # 読み込んだAPIキー (パス, 更新時刻, キー)。ファイルが変わっていなければ読み直さない
+        self._key_cache = (None, 0, None)
+        # ウィンドウのリサイズで再描画が連続しないよう、予約中の after ID と直前のサイズを保持する
+        self._resize_after_id = None
+        self._last_size = None
+        # 表示中の画像のデコード結果 (パス, PIL.Image, 元画像のサイズ)。リサイズのたびにファイルを読み直さないため
+        # デコーダースレッドだけが読み書きする
+        self._decoded = (None, None, None)
+        # 一括処理中のUI更新をアイドル時に1回へまとめるための最新状態とフラグ
+        self._ui_lock = threading.Lock()
+        self._ui_dirty = False
+        self._ui_state = {}
+        # ワーカースレッドからメインスレッドへの呼び出しキュー (50msごとにまとめて実行する)
+        self._ui_q = queue.Queue()
+        # プレビューのデコード依頼 (パス, 幅, 高さ)。UIスレッドを止めないよう別スレッドで処理し、最新の1件だけを保持する
+        self._decoder_q = queue.Queue(maxsize=1)
+        threading.Thread(target=self._decoder_loop, daemon=True).start()
 
         self._setup_ui(master)
         
@@ -38,8 +127,11 @@ class GeminiImageProcessorApp:
         
         # 💡 【変更点 4】起動時にAPIクライアントの初期化を試みる
         self.client = self._initialize_client(show_error=True)
+        # generate_content のたびに self.client.models を辿らないよう保持しておく
+        self.models = self.client.models if self.client else None
         
         master.bind("<Configure>", self.on_window_resize) 
+        self.master.after(50, self._drain_ui_q)
     
     def _setup_ui(self, master):
         # メインフレーム
@@ -81,11 +173,11 @@ class GeminiImageProcessorApp:
         
         ttk.Label(list_container, text="画像ファイルリスト").grid(row=0, column=0, sticky="w")
         
-        list_scrollbar = ttk.Scrollbar(list_container, orient=tk.VERTICAL)
-        self.image_listbox = tk.Listbox(list_container, height=25, yscrollcommand=list_scrollbar.set)
-        list_scrollbar.config(command=self.image_listbox.yview)
+        self.list_scrollbar = ttk.Scrollbar(list_container, orient=tk.VERTICAL)
+        self.image_listbox = tk.Listbox(list_container, height=25, yscrollcommand=self._on_list_scroll)
+        self.list_scrollbar.config(command=self.image_listbox.yview)
         
-        list_scrollbar.grid(row=1, column=1, sticky="ns")
+        self.list_scrollbar.grid(row=1, column=1, sticky="ns")
         self.image_listbox.grid(row=1, column=0, sticky="nswe")
         self.image_listbox.bind("<<ListboxSelect>>", self.on_listbox_select)
         
@@ -110,6 +202,12 @@ class GeminiImageProcessorApp:
         self.process_all_button = ttk.Button(center_frame, text="リストのすべてをシーケンシャル処理", command=self.start_all_processing_thread, state=tk.DISABLED)
         self.process_all_button.grid(row=3, column=0, sticky="ew", pady=(2, 5))
         
+        worker_frame = ttk.Frame(center_frame)
+        worker_frame.grid(row=4, column=0, sticky="e")
+        ttk.Label(worker_frame, text="同時リクエスト数:").pack(side=tk.LEFT, padx=5)
+        self.worker_count_var = tk.IntVar(value=DEFAULT_WORKERS)
+        ttk.Spinbox(worker_frame, from_=1, to=MAX_WORKERS, textvariable=self.worker_count_var, width=4).pack(side=tk.LEFT)
+        
         # --- Column 2: 右側 - 結果テキスト/進捗 ---
         right_frame = ttk.Frame(content_frame)
         right_frame.grid(row=0, column=2, sticky="nswe")
@@ -129,6 +227,10 @@ class GeminiImageProcessorApp:
         
         self.result_text = tk.Text(right_frame, height=15, wrap=tk.WORD)
         self.result_text.grid(row=2, column=0, sticky="nswe")
+        self.result_text.tag_config('cached', foreground='blue')
+        self.result_text.tag_config('error', foreground='red')
+        # 直前に表示した (テキスト, エラーか, キャッシュか)。同じ内容なら書き直さない
+        self._last_result_text = None
 
 
     # --- APIキーファイル設定ロジック ---
@@ -173,22 +275,26 @@ class GeminiImageProcessorApp:
             self.api_key_path_var.set(file_selected)
             # クライアントを再初期化して、処理ボタンの状態を更新
             self.client = self._initialize_client(show_error=True)
+            self.models = self.client.models if self.client else None
             self.reset_ui_state() # 状態をリセットし、ボタンの状態を再評価させる
 
     def _load_api_key_from_file(self):
         """設定されているパスからAPIキーを読み込む"""
-        if not self.api_key_path or not os.path.exists(self.api_key_path):
-            return None # パスが設定されていない、またはファイルが存在しない
+        if not self.api_key_path:
+            return None # パスが設定されていない
 
         try:
+            mtime = os.stat(self.api_key_path).st_mtime_ns
+            if (self.api_key_path, mtime) == self._key_cache[:2]:
+                return self._key_cache[2]
+            
             with open(self.api_key_path, 'r', encoding='utf-8') as f:
                 # 最初の行を読み込み、前後の空白や改行を除去
-                key = f.readline().strip() 
-                if not key:
-                    return None
-                return key
+                key = f.readline().strip() or None
+            self._key_cache = (self.api_key_path, mtime, key)
+            return key
         except Exception:
-            return None
+            return None # ファイルが存在しない、または読み込めない
 
     def _initialize_client(self, show_error=False):
         """APIキーを読み込み、Geminiクライアントを初期化する"""
@@ -201,7 +307,10 @@ class GeminiImageProcessorApp:
             
         try:
             # APIクライアントの初期化 (読み込んだAPIキーを使用)
-            return genai.Client(api_key=api_key)
+            client = _CLIENT_CACHE.get(api_key)
+            if client is None:
+                client = _CLIENT_CACHE[api_key] = genai.Client(api_key=api_key)
+            return client
         except Exception as e:
             if show_error:
                 messagebox.showerror("APIエラー", f"APIクライアントの初期化に失敗しました。\nキーが不正である可能性があります。\nエラー: {e}")
@@ -210,43 +319,97 @@ class GeminiImageProcessorApp:
     # --- GUI 操作とイベント処理 (変更なし) ---
     
     def on_window_resize(self, event):
+        # 子ウィジェットから伝播してきたイベントや、サイズの変わらないイベントは無視する
+        if event.widget is not self.master: return
+        size = (event.width, event.height)
+        if size == self._last_size: return
+        self._last_size = size
+        
         if self.current_image_path:
-            self.master.after(100, self.redraw_image_on_canvas)
+            # ドラッグ中は予約を延期し続け、最後のイベントから100ms後に1回だけ再描画する
+            if self._resize_after_id:
+                self.master.after_cancel(self._resize_after_id)
+            self._resize_after_id = self.master.after(100, self._do_resize)
+
+    def _do_resize(self):
+        self._resize_after_id = None
+        self.redraw_image_on_canvas()
 
     def redraw_image_on_canvas(self):
-        # ... (元のロジックを保持)
+        """表示中の画像のデコードと縮小をデコーダースレッドに依頼する"""
         if not self.current_image_path:
             return
 
-        try:
-            original_img = Image.open(self.current_image_path)
-            
-            # 描画を強制し、最新のサイズを取得
-            self.image_display_canvas.update_idletasks()
-            canvas_width = self.image_display_canvas.winfo_width()
-            canvas_height = self.image_display_canvas.winfo_height()
-            
-            if canvas_width < 50 or canvas_height < 50: return
-
-            original_width, original_height = original_img.size
-            ratio = min(canvas_width / original_width, canvas_height / original_height)
-            new_width = int(original_width * ratio)
-            new_height = int(original_height * ratio)
+        # 描画を強制し、最新のサイズを取得
+        self.image_display_canvas.update_idletasks()
+        canvas_width = self.image_display_canvas.winfo_width()
+        canvas_height = self.image_display_canvas.winfo_height()
+        
+        if canvas_width < 50 or canvas_height < 50: return
 
-            resized_img = original_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            self.tk_image = ImageTk.PhotoImage(resized_img)
-            
-            self.image_display_canvas.delete("all")
+        # まだ処理されていない古い依頼は捨て、最新の1件だけを渡す
+        try:
+            self._decoder_q.get_nowait()
+        except queue.Empty:
+            pass
+        self._decoder_q.put_nowait((self.current_image_path, canvas_width, canvas_height))
+
+    def _decoder_loop(self):
+        """プレビュー画像のデコードと縮小を行う (デコーダースレッド)"""
+        while True:
+            path, canvas_width, canvas_height = self._decoder_q.get()
+            try:
+                resized_img = self._decode_preview(path, canvas_width, canvas_height)
+            except Exception as e:
+                print(f"再描画エラー: {e}")
+                continue
+            self._ui_q.put((self._apply_preview, (path, resized_img, canvas_width, canvas_height), {}))
+
+    def _decode_preview(self, image_path, canvas_width, canvas_height):
+        """画像をキャンバスに収まるサイズに縮小して返す (デコーダースレッド)"""
+        path, original_img, full_size = self._decoded
+        img = None
+        if path != image_path:
+            img = Image.open(image_path) # この時点ではヘッダのみ読み込まれる
+            full_size = img.size
+
+        original_width, original_height = full_size
+        ratio = min(canvas_width / original_width, canvas_height / original_height)
+        new_width = int(original_width * ratio)
+        new_height = int(original_height * ratio)
+
+        # 縮小デコードした画像では今回の表示サイズに足りない場合は読み直す
+        if img is None and original_img.size != full_size and original_img.size[0] < new_width:
+            img = Image.open(image_path)
+        if img is not None:
+            # JPEGは表示サイズに合わせて 1/2, 1/4, 1/8 でデコードさせる (PNGなどでは何もしない)
+            img.draft('RGB', (new_width, new_height))
+            img.load()
+            original_img = img
+            self._decoded = (image_path, img, full_size)
+
+        return original_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+    def _apply_preview(self, path, resized_img, canvas_width, canvas_height):
+        """縮小済みの画像をキャンバスに表示する (メインスレッド)"""
+        # 別の画像が選択された後に届いた古い結果は捨てる
+        if path != self.current_image_path: return
+        
+        self.tk_image = ImageTk.PhotoImage(resized_img)
+        
+        # 画像アイテムは1つだけ作り、以降は画像と座標だけを差し替える
+        if self.canvas_image_id is None:
             self.canvas_image_id = self.image_display_canvas.create_image(
                 canvas_width / 2, canvas_height / 2, 
                 image=self.tk_image, anchor="center"
             )
-            # 中央のダミーテキストは削除する
+        else:
+            self.image_display_canvas.itemconfig(self.canvas_image_id, image=self.tk_image)
+            self.image_display_canvas.coords(self.canvas_image_id, canvas_width / 2, canvas_height / 2)
+        # 中央のダミーテキストは削除する (次に _clear_image_display で作り直す)
+        if self.canvas_text:
             self.image_display_canvas.delete(self.canvas_text)
-
-        except Exception as e:
-            print(f"再描画エラー: {e}")
-            pass
+            self.canvas_text = None
 
     def select_folder(self):
         folder_selected = filedialog.askdirectory()
@@ -260,10 +423,17 @@ class GeminiImageProcessorApp:
         self.file_paths = []
         
         try:
-            for entry in sorted(os.scandir(self.current_folder), key=lambda e: e.name):
-                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
-                    self.file_paths.append(entry.path)
-                    self.image_listbox.insert(tk.END, entry.name)
+            # 先に画像ファイルだけに絞り込んでから、(名前, パス) を名前順に並べる
+            with os.scandir(self.current_folder) as it:
+                entries = [(entry.name, entry.path) for entry in it
+                           if entry.name[entry.name.rfind('.'):].lower() in _IMG_SUFFIXES and entry.is_file()]
+            entries.sort()
+            self._file_names = [name for name, _ in entries]
+            self.file_paths = [path for _, path in entries]
+            
+            # 最初の1ページ分だけ挿入し、残りはスクロールに合わせて追加する
+            self._listed = 0
+            self._extend_listbox(LISTBOX_PAGE_SIZE)
             
             self.reset_ui_state()
             if self.file_paths:
@@ -278,6 +448,19 @@ class GeminiImageProcessorApp:
         except FileNotFoundError:
             messagebox.showerror("エラー", "指定されたフォルダが見つかりません。")
 
+    def _extend_listbox(self, upto):
+        """リストボックスに先頭から upto 件目までのファイル名が入るよう、未挿入の分をまとめて追加する"""
+        upto = min(upto, len(self._file_names))
+        if upto > self._listed:
+            self.image_listbox.insert(tk.END, *self._file_names[self._listed:upto])
+            self._listed = upto
+
+    def _on_list_scroll(self, first, last):
+        self.list_scrollbar.set(first, last)
+        # 表示範囲が末尾付近に達したら次のページを追加する
+        if float(last) >= 0.9 and self._listed < len(self._file_names):
+            self._extend_listbox(self._listed + LISTBOX_PAGE_SIZE)
+
     def _clear_image_display(self, text="画像がありません"):
         # ... (元のロジックを保持)
         if self.canvas_image_id:
@@ -294,7 +477,6 @@ class GeminiImageProcessorApp:
              self.image_display_canvas.itemconfig(self.canvas_text, text=text)
 
         self.tk_image = None
-        self.image_display_canvas.delete(self.canvas_image_id)
 
 
     def on_listbox_select(self, event):
@@ -338,16 +520,17 @@ class GeminiImageProcessorApp:
 
     def update_result_text(self, text, is_error=False, is_cached=False):
         """結果テキストボックスを更新する (メインスレッド)"""
-        # ... (元のロジックを保持)
+        payload = (text, is_error, is_cached)
+        if payload == self._last_result_text: return
+        self._last_result_text = payload
+        
         self.result_text.delete('1.0', tk.END)
         
         if is_cached:
             self.result_text.insert(tk.END, "--- キャッシュ済み結果 ---\n", 'cached')
             self.result_text.insert(tk.END, text)
-            self.result_text.tag_config('cached', foreground='blue')
         elif is_error:
             self.result_text.insert(tk.END, f"エラー:\n{text}", 'error')
-            self.result_text.tag_config('error', foreground='red')
         else:
             self.result_text.insert(tk.END, text)
 
@@ -384,6 +567,7 @@ class GeminiImageProcessorApp:
         self.process_button.config(text="処理中...", state=tk.DISABLED)
         self.result_text.delete('1.0', tk.END)
         self.result_text.insert(tk.END, "Geminiにリクエストを送信しています...\n")
+        self._last_result_text = None
         
         thread = threading.Thread(target=self.process_single_image, daemon=True)
         thread.start()
@@ -393,25 +577,31 @@ class GeminiImageProcessorApp:
         image_path = self.current_image_path
         
         try:
-            img_to_send = Image.open(image_path)
-            prompt_parts = [img_to_send, "テキストに変換してください。"]
-            response = self.client.models.generate_content(model=MODEL_NAME, contents=prompt_parts)
-            description = response.text.strip()
+            # 💡 同じ内容の画像を以前に処理していればAPIを呼ばない
+            key = CacheStore.build_key(image_path)
+            description = self.cache_store.get(key)
+            is_cached = description is not None
+            
+            if not is_cached:
+                img_to_send = _prepare_for_gemini(image_path)
+                response = self.models.generate_content(model=MODEL_NAME, contents=[img_to_send, PROMPT_TEXT])
+                description = response.text.strip()
+                self.cache_store.set(key, description)
             
             # 💡 キャッシュに保存
             self.response_cache[image_path] = description
             
-            self.master.after(0, self.update_result_text, description)
+            self._ui_q.put((self.update_result_text, (description, False, is_cached), {}))
 
         except APIError as e:
             error_msg = f"APIエラーが発生しました: {e}\n\n無料枠の上限に達している可能性があります。"
-            self.master.after(0, self.update_result_text, error_msg, is_error=True)
+            self._ui_q.put((self.update_result_text, (error_msg,), {'is_error': True}))
         except Exception as e:
             error_msg = f"予期せぬエラーが発生しました: {e}"
-            self.master.after(0, self.update_result_text, error_msg, is_error=True)
+            self._ui_q.put((self.update_result_text, (error_msg,), {'is_error': True}))
             
         finally:
-            self.master.after(0, self.reset_button)
+            self._ui_q.put((self.reset_button, (), {}))
 
     # --- シーケンシャル処理ロジック (変更なし) ---
 
@@ -425,8 +615,14 @@ class GeminiImageProcessorApp:
         self.process_all_button.config(text="処理を停止", command=self.stop_all_processing)
         self.result_text.delete('1.0', tk.END)
         self.result_text.insert(tk.END, "--- シーケンシャル処理開始 ---\n結果はファイルに保存されます。\n\n")
+        self._last_result_text = None
 
-        thread = threading.Thread(target=self.process_all_images_with_gemini, daemon=True)
+        # Tk変数はワーカースレッドから読まないよう、ここで同時リクエスト数を確定させる
+        try:
+            workers = min(max(int(self.worker_count_var.get()), 1), MAX_WORKERS)
+        except (tk.TclError, ValueError):
+            workers = DEFAULT_WORKERS
+        thread = threading.Thread(target=self.process_all_images_with_gemini, args=(workers,), daemon=True)
         thread.start()
 
     def stop_all_processing(self):
@@ -436,73 +632,128 @@ class GeminiImageProcessorApp:
         messagebox.showinfo("情報", "処理を中断しています。現在のファイルが完了後、停止します。")
 
 
-    def process_all_images_with_gemini(self):
-        # ... (元のロジックを保持)
-        total_files = len(self.file_paths)
+    def _request_description(self, image_path):
+        """1枚の画像をGeminiに送信し、(結果テキスト, ステータス, エラーか) を返す (ワーカースレッド)"""
+        try:
+            # 💡 同じ内容の画像を以前に処理していればAPIを呼ばない
+            key = CacheStore.build_key(image_path)
+            cached = self.cache_store.get(key)
+            if cached is not None:
+                return cached, "成功 (キャッシュ)", False
+            
+            img_to_send = _prepare_for_gemini(image_path)
+            
+            response = self.models.generate_content(
+                model=MODEL_NAME,
+                contents=[img_to_send, PROMPT_TEXT]
+            )
+            description = response.text.strip()
+            self.cache_store.set(key, description)
+            return description, "成功", False
+        except APIError as e:
+            return f"【APIエラー】: {e}", "失敗 (API)", True
+        except Exception as e:
+            return f"【エラー】: {e}", "失敗 (その他)", True
+
+    def process_all_images_with_gemini(self, workers=DEFAULT_WORKERS):
+        """リスト内の画像を最大 workers 件ずつ並列にGeminiへ送信し、結果を元の順序でファイルに書き出す"""
+        file_paths = list(self.file_paths)
+        total_files = len(file_paths)
         processed_count = 0
+        results = [None] * total_files # index -> (結果テキスト, ステータス, エラーか)
+        interrupted = False
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = os.path.join(self.current_folder, f"{OUTPUT_FILENAME_BASE}_{timestamp}.txt")
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as outfile:
-                outfile.write(f"--- Gemini シーケンシャル処理結果 ({timestamp}) ---\n")
-                outfile.write(f"モデル: {MODEL_NAME}\n")
-                outfile.write(f"プロンプト: テキストに変換してください。\n\n")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                for i, image_path in enumerate(file_paths):
+                    # 💡 キャッシュ済みの画像はリクエストを送らない
+                    if image_path in self.response_cache:
+                        results[i] = (self.response_cache[image_path], "成功 (キャッシュ)", False)
+                        processed_count += 1
+                    else:
+                        futures[executor.submit(self._request_description, image_path)] = i
                 
-                for i, image_path in enumerate(self.file_paths):
+                for future in as_completed(futures):
                     if not self.is_processing:
-                        outfile.write("\n--- ユーザーにより処理が中断されました ---\n")
+                        # 未着手のリクエストは取り消す (送信中のものは完了を待つ)
+                        interrupted = True
+                        for pending in futures: pending.cancel()
                         break
                     
-                    filename = os.path.basename(image_path)
+                    i = futures[future]
+                    image_path = file_paths[i]
+                    description, status, is_error = future.result()
+                    results[i] = (description, status, is_error)
+                    processed_count += 1
                     
-                    self.master.after(0, self.update_progress, i + 1, total_files, filename)
-                    self.master.after(0, self.highlight_listbox, i)
-
-                    description = ""
-                    status = "成功"
-                    is_error = False
-
-                    try:
-                        img_to_send = Image.open(image_path)
-                        prompt_parts = [img_to_send, "テキストに変換してください。"]
-                        
-                        response = self.client.models.generate_content(
-                            model=MODEL_NAME,
-                            contents=prompt_parts
-                        )
-                        description = response.text.strip()
-                        
+                    if not is_error:
                         # 💡 キャッシュに保存
                         self.response_cache[image_path] = description
-                        # 処理結果をテキストボックスに表示 (キャッシュではないので is_cached=False)
-                        self.master.after(0, self.update_result_text, description, False)
-
-                    except APIError as e:
-                        description = f"【APIエラー】: {e}"
-                        status = "失敗 (API)"
-                        is_error = True
-                        self.master.after(0, self.update_result_text, description, True)
-                    except Exception as e:
-                        description = f"【エラー】: {e}"
-                        status = "失敗 (その他)"
-                        is_error = True
-                        self.master.after(0, self.update_result_text, description, True)
-
-                    outfile.write(f"--- {i+1}/{total_files} | ファイル名: {filename} ({status}) ---\n")
-                    outfile.write(f"{description}\n\n")
                     
-                    processed_count += 1
+                    # 進捗・リスト選択・結果表示は最新の状態だけをアイドル時にまとめて反映する
+                    self._post_ui_state(current=processed_count, total=total_files, filename=os.path.basename(image_path),
+                                        index=i, result=description, is_error=is_error)
+            
+            # 完了順ではなくリストの順序で組み立て、1回の write でまとめて書き出す
+            records = [
+                f"--- Gemini シーケンシャル処理結果 ({timestamp}) ---\n"
+                f"モデル: {MODEL_NAME}\n"
+                f"プロンプト: {PROMPT_TEXT}\n\n"
+            ]
+            for i, result in enumerate(results):
+                if result is None: continue
+                description, status, _ = result
+                records.append(f"--- {i+1}/{total_files} | ファイル名: {os.path.basename(file_paths[i])} ({status}) ---\n{description}\n\n")
+            if interrupted:
+                records.append("\n--- ユーザーにより処理が中断されました ---\n")
+            
+            with open(output_path, 'w', encoding='utf-8') as outfile:
+                outfile.write(''.join(records))
             
+            # 完了処理も同じキューに積むので、未反映の _flush_ui より後に実行される
             final_status = f"処理完了: {processed_count} / {total_files} ファイル | 結果ファイル: {os.path.basename(output_path)}"
-            self.master.after(0, self.update_status_and_finish, final_status, output_path)
+            self._ui_q.put((self.update_status_and_finish, (final_status, output_path), {}))
 
         except Exception as e:
-            self.master.after(0, self.update_status_and_finish, f"致命的なエラーが発生しました: {e}", output_path, is_error=True)
+            self._ui_q.put((self.update_status_and_finish, (f"致命的なエラーが発生しました: {e}", output_path), {'is_error': True}))
             
         finally:
-            self.master.after(0, self.reset_ui_state)
+            self._ui_q.put((self.reset_ui_state, (), {}))
+
+    def _post_ui_state(self, **state):
+        """ワーカースレッドからUIの最新状態を登録し、反映が未予約なら予約する"""
+        with self._ui_lock:
+            self._ui_state.update(state)
+            if self._ui_dirty: return
+            self._ui_dirty = True
+        self._ui_q.put((self._flush_ui, (), {}))
+
+    def _flush_ui(self):
+        """登録された最新状態をまとめてUIに反映する (メインスレッド)"""
+        with self._ui_lock:
+            state = dict(self._ui_state)
+            self._ui_dirty = False
+        self.update_progress(state['current'], state['total'], state['filename'])
+        self.highlight_listbox(state['index'])
+        # 処理結果をテキストボックスに表示 (キャッシュではないので is_cached=False)
+        self.update_result_text(state['result'], state['is_error'])
+
+    def _drain_ui_q(self):
+        """キューに溜まったUI呼び出しをまとめて実行し、50ms後に再度予約する (メインスレッド)"""
+        try:
+            while True:
+                try:
+                    fn, args, kw = self._ui_q.get_nowait()
+                except queue.Empty:
+                    break
+                fn(*args, **kw)
+        finally:
+            # 途中の呼び出しで例外が出てもポーリングは止めない
+            self.master.after(50, self._drain_ui_q)
 
     def update_progress(self, current, total, filename):
         # ... (元のロジックを保持)
@@ -511,6 +762,7 @@ class GeminiImageProcessorApp:
 
     def highlight_listbox(self, index):
         # ... (元のロジックを保持)
+        self._extend_listbox(index + 1)
         self.image_listbox.selection_clear(0, tk.END)
         self.image_listbox.select_set(index)
         self.image_listbox.activate(index)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import ytd_with_extract as ytd
+
+HAS_FFMPEG = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def _format_tags(path: Path) -> dict:
+    out = subprocess.run(["ffprobe", "-v", "error", "-show_entries", "format_tags", "-of", "json", str(path)],
+                         stdout=subprocess.PIPE, check=True).stdout
+    return {k.lower(): v for k, v in (json.loads(out).get("format", {}).get("tags") or {}).items()}
+
+
+class ExtractAudioBatchTest(unittest.TestCase):
+    def test_each_output_maps_its_own_metadata_and_chapters(self):
+        jobs = [(Path(f"{n}.mp4"), Path(f"{n}.m4a"), ytd._CODEC_PLAN["aac"]) for n in range(3)]
+        with mock.patch.object(ytd, "_run", return_value=ytd.ProcResult(0, b"", b"")) as run, \
+                mock.patch.object(ytd, "_nonempty", return_value=True):
+            ytd._extract_audio_batch(jobs)
+        cmd = run.call_args[0][0]
+        start = cmd.index(str(jobs[-1][0])) + 1
+        for n, (_, dst, _) in enumerate(jobs):
+            # 出力ファイル名の直前までが、その出力に掛かるオプション
+            end = cmd.index(str(dst))
+            opts, start = cmd[start:end], end + 1
+            self.assertEqual(opts[opts.index("-map") + 1], f"{n}:a:0")
+            self.assertEqual(opts[opts.index("-map_metadata") + 1], str(n))
+            self.assertEqual(opts[opts.index("-map_chapters") + 1], str(n))
+
+    @unittest.skipUnless(HAS_FFMPEG, "ffmpeg/ffprobe が必要")
+    def test_batched_outputs_keep_per_file_tags(self):
+        with tempfile.TemporaryDirectory() as d:
+            d = Path(d)
+            jobs = []
+            for name, title in (("a", "FIRST"), ("b", "SECOND")):
+                src = d / f"{name}.mp4"
+                subprocess.run(["ffmpeg", "-v", "error", "-y",
+                                "-f", "lavfi", "-i", "color=size=32x32:duration=1",
+                                "-f", "lavfi", "-i", "sine=duration=1",
+                                "-c:v", "mpeg4", "-c:a", "aac", "-metadata", f"title={title}", str(src)], check=True)
+                jobs.append((src, d / f"{name}.m4a", ytd._CODEC_PLAN["aac"]))
+
+            results = ytd._extract_audio_batch(jobs)
+
+            self.assertTrue(all(ok for ok, _, _ in results))
+            self.assertEqual(_format_tags(d / "a.m4a").get("title"), "FIRST")
+            self.assertEqual(_format_tags(d / "b.m4a").get("title"), "SECOND")
+
+
+class ExtractAllAudiosTest(unittest.TestCase):
+    def test_only_given_targets_are_extracted(self):
+        streams = {"streams": [{"codec_type": "audio", "codec_name": "vorbis"}]}
+        with mock.patch.object(ytd, "_media_files", return_value=[Path("v.webm"), Path("v [audio].webm")]), \
+                mock.patch.object(ytd, "_existing_names", return_value=set()), \
+                mock.patch.object(ytd, "_probe_full", return_value=streams), \
+                mock.patch.object(ytd, "_extract_audio_batch", return_value=[]) as batch:
+            ytd.extract_all_audios(Path("."), targets=[Path("v [audio].webm")])
+        jobs = batch.call_args[0][0]
+        self.assertEqual([(src, dst) for src, dst, _ in jobs], [(Path("v [audio].webm"), Path("v [audio].ogg"))])
+
+
+class MergedAudioCoversBestaudioTest(unittest.TestCase):
+    # --write-info-json の出力には requested_formats が無く、format_id と formats だけが残る
+    INFO = {
+        "format_id": "137+140",
+        "formats": [
+            {"format_id": "140", "vcodec": "none", "acodec": "mp4a.40.2", "protocol": "https"},
+            {"format_id": "137", "vcodec": "avc1.640028", "acodec": "none", "protocol": "https"},
+        ],
+    }
+
+    def _covers(self, info, streams):
+        with mock.patch.object(ytd, "_media_files", return_value=[Path("merged.mp4")]), \
+                mock.patch.object(ytd, "_probe_full", return_value={"streams": streams}):
+            return ytd.merged_audio_covers_bestaudio(info, Path("."))
+
+    def test_audio_format_is_resolved_from_format_id(self):
+        streams = [{"codec_type": "video", "codec_name": "h264"}, {"codec_type": "audio", "codec_name": "aac"}]
+        self.assertTrue(self._covers(self.INFO, streams))
+
+    def test_different_codec_in_merged_file(self):
+        streams = [{"codec_type": "video", "codec_name": "h264"}, {"codec_type": "audio", "codec_name": "opus"}]
+        self.assertFalse(self._covers(self.INFO, streams))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@
 yt-dlp GUIラッパー（CLI直接実行版 + 標準出力Verbose）
  
 機能:
-  - 複数URLの一括ダウンロード
+  - 複数URLの一括ダウンロード (同時実行数を指定可能)
   - 事前フォルダ存在チェック
   - CLI (yt-dlp) 直接呼び出しによる安定化
   - コンソールへの進行状況出力 (print)
@@ -17,13 +17,28 @@ from tkinter import ttk, filedialog, messagebox
 import re
 import json
 import subprocess
+import shutil
+import tempfile
 import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dataclasses import dataclass
+from functools import cached_property
 from urllib.parse import urlparse
 
 # ---------------------- 設定ファイルユーティリティ ----------------------
 SETTINGS_FILE = "settings.json"
+# 同時に実行するダウンロードタスク数の既定値/上限
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+# 同時実行数を見直す間隔(ms)と、増やしたときに必要な全体スループットの伸び率
+CONCURRENCY_ADJUST_MS = 5000
+CONCURRENCY_MIN_GAIN = 1.05
+# ログ欄に残す最大行数 (Text ウィジェットは行数に比例して重くなるため古い行から捨てる)
+LOG_MAX_LINES = 5000
+# 実行中にワーカーからのイベントを取り出す間隔(ms)
+EVENT_POLL_MS = 100
 
 def load_settings():
     if not os.path.exists(SETTINGS_FILE):
@@ -34,12 +49,29 @@ def load_settings():
     except Exception:
         return {}
 
+# 設定の書き込みは保存スレッドと終了時の同期保存の両方から行われるので、1つずつ順に行う
+_SETTINGS_LOCK = threading.Lock()
+
 def save_settings(data: dict):
-    try:
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+    # 一時ファイルに書いてから置き換え、書き込み途中で落ちても壊れたJSONが残らないようにする。
+    # 一時ファイル名は毎回別にし、他の書き込みと同じファイルを共有しない
+    with _SETTINGS_LOCK:
+        tmp = None
+        try:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(os.path.abspath(SETTINGS_FILE)),
+                                             prefix=SETTINGS_FILE + ".", suffix=".tmp", delete=False) as f:
+                tmp = f.name
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                # 置き換え後に電源断などで中身が空のファイルにならないよう、ディスクへ書き出してから置き換える
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, SETTINGS_FILE)
+        except Exception:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
 
 # ---------------------- ログ出力ヘルパー ----------------------
 def console_log(msg):
@@ -48,142 +80,276 @@ def console_log(msg):
     print(f"[{now}] {msg}")
 
 # ---------------------- ffmpeg/ffprobe ユーティリティ ----------------------
-def _run(cmd):
+class ProcResult:
+    """_run の結果。出力はバイト列のまま持ち、文字列が必要になった時だけデコードする"""
+    def __init__(self, returncode: int, stdout_bytes: bytes, stderr_bytes: bytes):
+        self.returncode = returncode
+        self.stdout_bytes = stdout_bytes
+        self.stderr_bytes = stderr_bytes
+
+    @cached_property
+    def stdout(self) -> str:
+        return self.stdout_bytes.decode("utf-8", errors="replace")
+
+    @cached_property
+    def stderr(self) -> str:
+        return self.stderr_bytes.decode("utf-8", errors="replace")
+
+def _run(cmd) -> ProcResult:
     # Windowsでウィンドウを出さないための設定
     startupinfo = None
     if os.name == 'nt':
         startupinfo = subprocess.STARTUPINFO()
         startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        
-    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', startupinfo=startupinfo)
 
-def _probe_audio_codec(path: Path):
+    # ffmpeg の stderr は数MBになることもあり、使うのは失敗時だけなのでここではデコードしない
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=startupinfo)
+    return ProcResult(proc.returncode, proc.stdout, proc.stderr)
+
+# (パス, 更新時刻, サイズ) -> ffprobe の結果。同じファイルを何度も ffprobe しないため
+_PROBE_CACHE: dict[tuple[str, int, int], dict] = {}
+
+def _probe_full(path: Path) -> dict:
+    """ffprobe で全ストリームの種別/コーデックをまとめて取得する (結果はキャッシュ)"""
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    data = _PROBE_CACHE.get(key)
+    if data is not None:
+        return data
     cmd = [
         "ffprobe", "-v", "error",
-        "-select_streams", "a:0",
-        "-show_entries", "stream=codec_name",
+        # 使うのはストリームの種別とコーデック名だけなので、それ以外は出力させない
+        "-show_entries", "stream=codec_type,codec_name",
         "-of", "json",
         str(path),
     ]
     proc = _run(cmd)
     try:
-        data = json.loads(proc.stdout)
-        streams = data.get("streams") or []
-        if not streams:
-            return None
-        return streams[0].get("codec_name")
+        data = json.loads(proc.stdout_bytes)
     except Exception:
-        return None
+        data = {}
+    _PROBE_CACHE[key] = data
+    return data
 
 def _probe_stream_types(path: Path) -> tuple[bool, bool]:
-    cmd = [
-        "ffprobe", "-v", "error",
-        "-show_streams",
-        "-of", "json",
-        str(path),
-    ]
-    proc = _run(cmd)
     has_v = False
     has_a = False
-    try:
-        data = json.loads(proc.stdout)
-        for s in data.get("streams") or []:
-            codec_type = s.get("codec_type")
-            if codec_type == "video":
-                has_v = True
-            elif codec_type == "audio":
-                has_a = True
-    except Exception:
-        pass
+    for s in _probe_full(path).get("streams") or []:
+        codec_type = s.get("codec_type")
+        if codec_type == "video":
+            has_v = True
+        elif codec_type == "audio":
+            has_a = True
+        if has_v and has_a:
+            break
     return has_v, has_a
 
-@dataclass
+_MEDIA_SUFFIXES = frozenset({".mp4", ".webm", ".mkv"})
+
+def _media_entries(outdir: Path) -> list[os.DirEntry]:
+    """フォルダ内の動画ファイル (mp4/webm/mkv) の DirEntry を名前順で返す。ディレクトリの走査は1回だけ"""
+    with os.scandir(outdir) as it:
+        return sorted((e for e in it if os.path.splitext(e.name)[1].lower() in _MEDIA_SUFFIXES and e.is_file()),
+                      key=lambda e: e.name)
+
+def _media_files(outdir: Path) -> list[Path]:
+    return [Path(e.path) for e in _media_entries(outdir)]
+
+def _nonempty(path: Path) -> bool:
+    """ファイルが存在し、中身があるか (stat は1回だけ)"""
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+def _existing_names(outdir: Path) -> set[str]:
+    """フォルダ内の全エントリ名 (normcase 済み)。出力名の重複判定に使う"""
+    with os.scandir(outdir) as it:
+        return {os.path.normcase(e.name) for e in it}
+
+def prewarm_probe_cache(outdir: Path):
+    """フォルダ内の動画ファイルを並列に ffprobe し、キャッシュに載せておく"""
+    targets = _media_files(outdir)
+    if not targets:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(targets), os.cpu_count() or 1)) as pool:
+        list(pool.map(_probe_full, targets))
+
+@dataclass(frozen=True, slots=True)
 class _Plan:
     ext: str
-    extra_args: list
+    extra_args: tuple[str, ...] = ()
+
+_WAV_PLAN = _Plan(".wav", ("-f", "wav"))
 
 _CODEC_PLAN = {
-    "aac": _Plan(".m4a", []),
-    "alac": _Plan(".m4a", []),
-    "mp3": _Plan(".mp3", []),
-    "flac": _Plan(".flac", []),
-    "ac3": _Plan(".ac3", []),
-    "eac3": _Plan(".eac3", []),
-    "opus": _Plan(".mka", ["-f", "matroska"]),
-    "vorbis": _Plan(".ogg", ["-f", "ogg"]),
+    "aac": _Plan(".m4a"),
+    "alac": _Plan(".m4a"),
+    "mp3": _Plan(".mp3"),
+    "flac": _Plan(".flac"),
+    "ac3": _Plan(".ac3"),
+    "eac3": _Plan(".eac3"),
+    "opus": _Plan(".mka", ("-f", "matroska")),
+    "vorbis": _Plan(".ogg", ("-f", "ogg")),
+    # よく出る PCM は表に直接載せ、それ以外の pcm_* だけ _plan_for で前方一致を見る
+    "pcm_s16le": _WAV_PLAN,
+    "pcm_s24le": _WAV_PLAN,
+    "pcm_s32le": _WAV_PLAN,
+    "pcm_f32le": _WAV_PLAN,
+}
+
+# 出力形式 -> 同じ中身をそのまま格納できる入力側の拡張子 (音声だけのファイルなら抽出し直す意味がない)
+_SAME_CONTAINER = {
+    ".m4a": frozenset({".m4a", ".mp4"}),
+    ".mka": frozenset({".mka", ".mkv", ".webm"}),
 }
 
 def _plan_for(codec: str | None):
     if not codec:
         return None
-    if codec.startswith("pcm_"):
-        return _Plan(".wav", ["-f", "wav"])
-    return _CODEC_PLAN.get(codec)
+    plan = _CODEC_PLAN.get(codec)
+    if plan is None and codec.startswith("pcm_"):
+        return _WAV_PLAN
+    return plan
+
+# ffmpeg の標準エラーはエラー時の表示にしか使わないので、バナーと進捗行を出させない
+_FFMPEG_QUIET = ["-hide_banner", "-nostats", "-loglevel", "error"]
+# 複数の入力を読みながら書き出すときの出力側キュー。既定の小さいキューで溢れると ffmpeg がエラー終了する
+_MUX_QUEUE = ["-max_muxing_queue_size", "1024"]
+
+# 1回の ffmpeg にまとめる入力ファイル数の上限 (同時に開くファイル数を抑える)
+EXTRACT_BATCH_SIZE = 16
 
 def _extract_audio_copy(src: Path, dst: Path, plan: _Plan):
-    cmd = ["ffmpeg", "-y", "-i", str(src), "-vn", "-acodec", "copy"] + plan.extra_args + [str(dst)]
+    cmd = ["ffmpeg", *_FFMPEG_QUIET, "-y", "-i", str(src), "-vn", "-acodec", "copy", *plan.extra_args, str(dst)]
     proc = _run(cmd)
-    ok = proc.returncode == 0 and dst.exists() and dst.stat().st_size > 0
-    return ok, proc.stderr
-
-def extract_all_audios(outdir: Path, log_cb=lambda s: None):
+    ok = proc.returncode == 0 and _nonempty(dst)
+    return ok, proc
+
+def _extract_audio_batch(jobs: list[tuple[Path, Path, _Plan]]):
+    """複数ファイルの音声を1回の ffmpeg でまとめて抽出し、[(ok, dst, proc), ...] を返す"""
+    if len(jobs) == 1:
+        src, dst, plan = jobs[0]
+        ok, proc = _extract_audio_copy(src, dst, plan)
+        return [(ok, dst, proc)]
+
+    cmd = ["ffmpeg", *_FFMPEG_QUIET, "-y"]
+    for src, _, _ in jobs:
+        cmd.extend(["-i", str(src)])
+    for n, (_, dst, plan) in enumerate(jobs):
+        # メタデータとチャプターは既定では最初の入力から全出力へコピーされるので、出力ごとに対応する入力を指定する
+        cmd.extend(["-map", f"{n}:a:0", "-map_metadata", str(n), "-map_chapters", str(n),
+                    "-c", "copy", *_MUX_QUEUE, *plan.extra_args, str(dst)])
+    proc = _run(cmd)
+    if proc.returncode == 0:
+        return [(_nonempty(dst), dst, proc) for _, dst, _ in jobs]
+
+    # どれか1つの入力が壊れているとまとめて失敗するので、1件ずつやり直す
+    console_log(f"    -> Batch failed, retrying one by one ({len(jobs)} files)")
+    results = []
+    for src, dst, plan in jobs:
+        ok, proc = _extract_audio_copy(src, dst, plan)
+        results.append((ok, dst, proc))
+    return results
+
+def extract_all_audios(outdir: Path, log_cb=lambda s: None, targets: list[Path] | None = None):
+    """targets を指定しなければフォルダ内の全動画ファイルが対象"""
     console_log(f"  [FFmpeg] 音声抽出処理を開始: {outdir}")
-    targets: list[Path] = []
-    for ext in ("*.mp4", "*.webm", "*.mkv"):
-        targets.extend(outdir.glob(ext))
-    targets = sorted(set(targets))
+    if targets is None:
+        targets = _media_files(outdir)
 
     if not targets:
         log_cb("対象ファイルなし")
         return
 
+    # 出力形式ごとに (入力, 出力, 方針) をまとめる。出力名は既存のファイル名と、
+    # 既に選んだ名前の集合で重複を判定する (候補ごとに stat しない)
+    taken = _existing_names(outdir)
+    groups: dict[str, list[tuple[Path, Path, _Plan]]] = {}
     for src in targets:
-        codec = _probe_audio_codec(src)
+        streams = _probe_full(src).get("streams") or []
+        codec = next((st.get("codec_name") for st in streams if st.get("codec_type") == "audio"), None)
         if not codec:
             continue
         plan = _plan_for(codec)
         if not plan:
             console_log(f"  [FFmpeg] Skip (未対応コーデック): {codec} in {src.name}")
             continue
+        # 既に音声1本だけのファイル (音声のみモードや追加オーディオ) は、コピーしても同じものができるだけなので飛ばす
+        if len(streams) == 1 and src.suffix.lower() in _SAME_CONTAINER.get(plan.ext, (plan.ext,)):
+            console_log(f"  [FFmpeg] Skip (音声のみ): {src.name}")
+            continue
 
         dst = src.with_suffix(plan.ext)
         i = 1
-        while dst.exists():
+        while os.path.normcase(dst.name) in taken:
             dst = src.with_name(f"{src.stem}_{i}{plan.ext}")
             i += 1
+        taken.add(os.path.normcase(dst.name))
 
         console_log(f"    -> Extracting: {src.name} -> {dst.name}")
-        ok, err = _extract_audio_copy(src, dst, plan)
-        if ok:
-            log_cb(f"✅ 音声出力: {dst.name}")
-        else:
-            console_log(f"    -> Failed: {err}")
-            log_cb(f"❌ 失敗: {dst.name}")
+        groups.setdefault(plan.ext, []).append((src, dst, plan))
+
+    # 同じ出力形式のファイルは EXTRACT_BATCH_SIZE 件ずつ1プロセスにまとめ、バッチ同士は並列に実行する
+    batches = [jobs[i:i + EXTRACT_BATCH_SIZE] for jobs in groups.values() for i in range(0, len(jobs), EXTRACT_BATCH_SIZE)]
+    if not batches:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(batches), os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(_extract_audio_batch, jobs) for jobs in batches]
+        for future in as_completed(futures):
+            for ok, dst, proc in future.result():
+                if ok:
+                    log_cb(f"✅ 音声出力: {dst.name}")
+                else:
+                    console_log(f"    -> Failed: {proc.stderr}")
+                    log_cb(f"❌ 失敗: {dst.name}")
+
+# yt-dlp の acodec 表記 (先頭部分) -> ffprobe の codec_name
+_ACODEC_TO_FFPROBE = {"mp4a": "aac", "opus": "opus", "vorbis": "vorbis", "flac": "flac", "mp3": "mp3"}
+
+def merged_audio_covers_bestaudio(info: dict, outdir: Path) -> bool:
+    """結合済みの動画ファイルが、追加オーディオと同じ bestaudio をそのまま含んでいるか"""
+    # info.json では requested_formats が取り除かれているので、format_id ("137+140" など) を formats から引き直す
+    by_id = {f.get("format_id"): f for f in info.get("formats") or []}
+    fmts = [by_id[fid] for fid in str(info.get("format_id") or "").split("+") if fid in by_id]
+    audio = next((f for f in fmts if f.get("vcodec") == "none" and f.get("acodec") not in (None, "none")), None)
+    # 追加オーディオは m3u8 以外を優先して選ぶので、m3u8 の音声が結合されていれば別物になりうる
+    if not audio or str(audio.get("protocol") or "").startswith("m3u8"):
+        return False
+    expected = _ACODEC_TO_FFPROBE.get(audio["acodec"].split(".", 1)[0])
+    if not expected:
+        return False
+    for p in _media_files(outdir):
+        streams = _probe_full(p).get("streams") or []
+        if any(st.get("codec_type") == "video" for st in streams) and \
+                any(st.get("codec_type") == "audio" and st.get("codec_name") == expected for st in streams):
+            return True
+    return False
 
 def mux_ragtag_av(outdir: Path, log_cb=lambda s: None):
     console_log(f"  [FFmpeg] ragtag結合処理を確認: {outdir}")
-    candidates: list[Path] = []
-    for ext in ("*.mp4", "*.webm", "*.mkv"):
-        candidates.extend(outdir.glob(ext))
+    candidates = _media_entries(outdir)
     if not candidates:
         return
 
-    video_only: list[Path] = []
-    audio_only: list[Path] = []
+    # (パス, サイズ)。サイズは走査時の DirEntry から取り、比較のたびに stat しない
+    video_only: list[tuple[Path, int]] = []
+    audio_only: list[tuple[Path, int]] = []
 
-    for p in candidates:
+    for e in candidates:
+        p = Path(e.path)
         has_v, has_a = _probe_stream_types(p)
         if has_v and not has_a:
-            video_only.append(p)
+            video_only.append((p, e.stat().st_size))
         elif has_a and not has_v:
-            audio_only.append(p)
+            audio_only.append((p, e.stat().st_size))
 
     if not video_only or not audio_only:
         console_log("  [FFmpeg] 結合対象なし (映像のみ/音声のみ のペアが見つかりません)")
         return
 
-    v = max(video_only, key=lambda x: x.stat().st_size)
-    a = max(audio_only, key=lambda x: x.stat().st_size)
+    v = max(video_only, key=lambda t: t[1])[0]
+    a = max(audio_only, key=lambda t: t[1])[0]
 
     console_log(f"  [FFmpeg] Muxing: {v.name} + {a.name}")
     log_cb(f"結合中: {v.name} + {a.name}")
@@ -191,20 +357,22 @@ def mux_ragtag_av(outdir: Path, log_cb=lambda s: None):
     dst = v.with_suffix("")
     dst = dst.with_name(dst.name + "_muxed.mkv")
 
+    taken = _existing_names(outdir)
     i = 1
-    while dst.exists():
+    while os.path.normcase(dst.name) in taken:
         dst = dst.with_name(f"{dst.stem}_{i}.mkv")
         i += 1
 
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", *_FFMPEG_QUIET, "-y",
         "-i", str(v),
         "-i", str(a),
         "-c", "copy",
+        *_MUX_QUEUE,
         str(dst),
     ]
     proc = _run(cmd)
-    if dst.exists() and dst.stat().st_size > 0 and proc.returncode == 0:
+    if proc.returncode == 0 and _nonempty(dst):
         console_log(f"    -> Mux Success: {dst.name}")
         log_cb(f"✅ 結合完了: {dst.name}")
     else:
@@ -212,38 +380,138 @@ def mux_ragtag_av(outdir: Path, log_cb=lambda s: None):
         log_cb(f"❌ 結合失敗")
 
 
+# ---------------------- Cookie ----------------------
+COOKIE_BROWSER = "chrome"
+
+def export_browser_cookies(path: Path) -> bool:
+    """ブラウザの Cookie を1回だけ復号して Netscape 形式のファイルへ書き出す"""
+    # URL なしで --cookies-from-browser と --cookies を渡すと、読み込んだ Cookie を保存して終了する
+    _run(["yt-dlp", "--cookies-from-browser", COOKIE_BROWSER, "--cookies", str(path)])
+    return _nonempty(path)
+
 # ---------------------- URL 関連ユーティリティ ----------------------
+_RE_YOUTUBE_ID = re.compile(
+    r"(?:https?://)?(?:www\.|m\.)?(?:youtube\.com/(?:watch\?v=|embed/|v/|shorts/)|youtu\.be/)([A-Za-z0-9_-]{11})"
+)
+
 def extract_youtube_id(url: str) -> str | None:
-    pattern = re.compile(
-        r"(?:https?://)?(?:www\.|m\.)?(?:youtube\.com/(?:watch\?v=|embed/|v/|shorts/)|youtu\.be/)([A-Za-z0-9_-]{11})"
-    )
-    match = pattern.search(url)
+    match = _RE_YOUTUBE_ID.search(url)
     return match.group(1) if match else None
 
-def derive_savedir_from_url(url: str, base_outdir: str) -> str:
+_RE_BILIBILI_BV = re.compile(r"(BV[0-9A-Za-z]+)")
+_RE_NICONICO_SM = re.compile(r"(sm\d+)")
+_RE_RAGTAG_V = re.compile(r"[?&]v=([0-9A-Za-z_-]+)")
+
+def _savedir_youtube(url: str, parsed, base_outdir: Path) -> Path | None:
     vid = extract_youtube_id(url)
-    if vid:
-        return os.path.join(base_outdir, vid)
+    return base_outdir / vid if vid else None
+
+def _savedir_bilibili(url: str, parsed, base_outdir: Path) -> Path | None:
+    m_bv = _RE_BILIBILI_BV.search(url)
+    return base_outdir / f"bilibili_{m_bv.group(1)}" if m_bv else None
+
+def _savedir_niconico(url: str, parsed, base_outdir: Path) -> Path | None:
+    m_ni = _RE_NICONICO_SM.search(url)
+    return base_outdir / f"niconico_{m_ni.group(1)}" if m_ni else None
+
+def _savedir_ragtag(url: str, parsed, base_outdir: Path) -> Path:
+    m_v = _RE_RAGTAG_V.search(url)
+    if m_v:
+        return base_outdir / f"ragtag_{m_v.group(1)}"
+    path = parsed.path.strip("/")
+    last = path.split("/")[-1] if path else "episode"
+    return base_outdir / f"ragtag_{last}"
+
+# ホスト名 (サブドメインを除いた末尾一致) -> 保存先フォルダの決め方
+_HOST_HANDLERS = {
+    "youtube.com": _savedir_youtube,
+    "youtu.be": _savedir_youtube,
+    "bilibili.com": _savedir_bilibili,
+    "b23.tv": _savedir_bilibili,
+    "nicovideo.jp": _savedir_niconico,
+    "nico.ms": _savedir_niconico,
+}
+
+def _handler_for_host(netloc: str):
+    host = netloc.lower().rsplit("@", 1)[-1].split(":", 1)[0]
+    if "ragtag" in host:
+        return _savedir_ragtag
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        handler = _HOST_HANDLERS.get(".".join(parts[i:]))
+        if handler:
+            return handler
+    return None
+
+@dataclass
+class UrlInfo:
+    """入力URL1件分の解析結果。on_start で一度だけ作り、ワーカーへそのまま渡す"""
+    url: str
+    netloc: str
+    is_ragtag: bool
+    savedir: Path
+
+def parse_url_info(url: str, base_outdir: str | Path) -> UrlInfo:
     parsed = urlparse(url)
-    m_bv = re.search(r"(BV[0-9A-Za-z]+)", url)
-    if m_bv:
-        bv = m_bv.group(1)
-        return os.path.join(base_outdir, f"bilibili_{bv}")
-    m_ni = re.search(r"(sm\d+)", url)
-    if m_ni:
-        smid = m_ni.group(1)
-        return os.path.join(base_outdir, f"niconico_{smid}")
+    netloc = parsed.netloc or ""
+    return UrlInfo(url, netloc, "ragtag" in netloc, _derive_savedir(url, parsed, Path(base_outdir)))
+
+def derive_savedir_from_url(url: str, base_outdir: str | Path) -> Path:
+    return _derive_savedir(url, urlparse(url), Path(base_outdir))
+
+def _derive_savedir(url: str, parsed, base_outdir: Path) -> Path:
+    # 既知のホストはそのサイト用の判定だけを行う
+    handler = _handler_for_host(parsed.netloc or "")
+    if handler:
+        savedir = handler(url, parsed, base_outdir)
+        if savedir:
+            return savedir
+    # 未知のホスト (スキーム省略を含む) や、ホスト別の判定で決まらなかった場合は順に試す
+    for fallback in (_savedir_youtube, _savedir_bilibili, _savedir_niconico):
+        savedir = fallback(url, parsed, base_outdir)
+        if savedir:
+            return savedir
     if "ragtag" in (parsed.netloc or ""):
-        m_v = re.search(r"[?&]v=([0-9A-Za-z_-]+)", url)
-        if m_v:
-            rag_id = m_v.group(1)
-            return os.path.join(base_outdir, f"ragtag_{rag_id}")
-        path = parsed.path.strip("/")
-        last = path.split("/")[-1] if path else "episode"
-        return os.path.join(base_outdir, f"ragtag_{last}")
+        return _savedir_ragtag(url, parsed, base_outdir)
     path = parsed.path.strip("/") or "download"
     sub = path.replace("/", "_")
-    return os.path.join(base_outdir, sub)
+    return base_outdir / sub
+
+# ---------------------- yt-dlp 出力解析 ----------------------
+# 進捗行 "[download]  12.3% of ..." の判定。正規表現は接頭辞が一致した行にだけ使う
+# 進捗行は整形済みの "12.3% ... at 5.67MiB/s" を解析せず、--progress-template で生の数値を出させる。
+# 値が無い項目は yt-dlp が "NA" と出力する
+_PROGRESS_PREFIX = "[progress]"
+_PROGRESS_TEMPLATE = ("download:" + _PROGRESS_PREFIX + " %(progress.downloaded_bytes)s"
+                      " %(progress.total_bytes)s %(progress.total_bytes_estimate)s %(progress.speed)s")
+# yt-dlp の標準出力を読むパイプのバッファサイズ
+PIPE_BUFSIZE = 1024 * 1024
+
+class _ConcurrencyLimiter:
+    """実行中に上限を変更できるセマフォ (with 文で1枠を確保する)"""
+    def __init__(self, limit: int):
+        self._cond = threading.Condition()
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+
+    def set_limit(self, limit: int):
+        with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    def __enter__(self):
+        with self._cond:
+            self.waiting += 1
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.waiting -= 1
+            self.active += 1
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
 
 # ---------------------- GUI 本体 ----------------------
 class YTDLPDownloaderGUI(tk.Tk):
@@ -254,13 +522,31 @@ class YTDLPDownloaderGUI(tk.Tk):
         self.minsize(720, 520)
 
         self.events = queue.Queue()
-        self.worker: threading.Thread | None = None
+        self._pending_log: list[str] = []  # process_events の1回分でまとめてログ欄へ書く行
+        self.pool: ThreadPoolExecutor | None = None
         
-        self.url_queue: list[str] = []
         self.total_tasks = 0
-        self.current_task_idx = 0
+        self.completed_tasks = 0
+        self.task_progress: dict[int, float] = {}  # タスク番号 -> 進捗(%)
+        self.task_speed: dict[int, float] = {}     # タスク番号 -> 直近の転送速度(bytes/s)
+        self.limiter: _ConcurrencyLimiter | None = None
+        # タスク番号 -> 事後処理まで終わったら立つフラグ (同じ保存先のタスクを順番に流すのに使う)
+        self._task_done: dict[int, threading.Event] = {}
+        self._closing = threading.Event()
+        self._last_step: tuple[int, float] | None = None  # 前回見直し時の (同時実行数, 全体スループット)
+        self._throttled = False  # 前回の見直し以降に HTTP 429 を受けたか
+        # ブラウザ Cookie は実行ごとに1回だけ書き出し、各 yt-dlp にはそのコピーを渡す
+        self._cookie_lock = threading.Lock()
+        self._cookie_dir: Path | None = None
+        self._cookie_file: Path | None = None
+        self._cookie_exported = False
 
         self.settings = load_settings()
+        # 設定の保存はバックグラウンドで行い、短時間の連続保存は1回の書き込みにまとめる
+        self._settings_dirty = threading.Event()
+        self._settings_stop = threading.Event()
+        self._settings_thread = threading.Thread(target=self._settings_writer, daemon=True)
+        self._settings_thread.start()
 
         # --- UI構成 ---
         frm_top = ttk.Frame(self, padding=12)
@@ -301,6 +587,12 @@ class YTDLPDownloaderGUI(tk.Tk):
         self.var_post_extract = tk.BooleanVar(value=True)
         ttk.Checkbutton(frm_checks, text="完了後に結合/音声抽出を実行", variable=self.var_post_extract).pack(side=tk.LEFT, padx=16)
 
+        frm_conc = ttk.Frame(grp_sel)
+        frm_conc.pack(fill=tk.X, anchor=tk.W, pady=(8,0))
+        ttk.Label(frm_conc, text="同時ダウンロード数").pack(side=tk.LEFT)
+        self.var_concurrency = tk.IntVar(value=self.settings.get("concurrency", DEFAULT_CONCURRENCY))
+        ttk.Spinbox(frm_conc, from_=1, to=MAX_CONCURRENCY, textvariable=self.var_concurrency, width=4).pack(side=tk.LEFT, padx=6)
+
         frm_btn = ttk.Frame(self, padding=(12, 0))
         frm_btn.pack(fill=tk.X)
         self.btn_start = ttk.Button(frm_btn, text="一括ダウンロード開始", command=self.on_start)
@@ -320,14 +612,47 @@ class YTDLPDownloaderGUI(tk.Tk):
         self.txt_log.insert("end", "コンソール（標準出力）にも詳細な進捗を表示します。\n")
         self.txt_log.configure(state="disabled")
 
-        self.after(100, self.process_events)
+        # イベントの取り出しはタスク実行中だけ行う (待機中に UI スレッドを起こし続けない)
+        self._polling = False
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def _request_save_settings(self):
+        self._settings_dirty.set()
+
+    def _set_setting(self, key, value):
+        """設定値を更新する。値が変わった時だけ保存を依頼する"""
+        if self.settings.get(key) != value:
+            self.settings[key] = value
+            self._request_save_settings()
+
+    def _settings_writer(self):
+        while True:
+            self._settings_dirty.wait()
+            if self._settings_stop.is_set():
+                return
+            time.sleep(0.3)
+            self._settings_dirty.clear()
+            save_settings(dict(self.settings))
+
+    def on_close(self):
+        # 保存スレッドを止めて書き込み中の分を終わらせてから、待ちの設定が失われないよう同期して保存する
+        self._settings_stop.set()
+        self._settings_dirty.set()
+        self._settings_thread.join(timeout=5)
+        save_settings(self.settings)
+        # 前のタスクの完了を待っている順番待ちのタスクは、完了通知が来なくなるので待たせずに終わらせる
+        self._closing.set()
+        for done in self._task_done.values():
+            done.set()
+        if self._cookie_dir is not None:
+            shutil.rmtree(self._cookie_dir, ignore_errors=True)
+        self.destroy()
 
     def browse_outdir(self):
         path = filedialog.askdirectory(initialdir=self.var_outdir.get() or os.path.expanduser("~"))
         if path:
             self.var_outdir.set(path)
-            self.settings["last_outdir"] = path
-            save_settings(self.settings)
+            self._set_setting("last_outdir", path)
 
     def on_start(self):
         raw_text = self.txt_url.get("1.0", "end").strip()
@@ -341,123 +666,226 @@ class YTDLPDownloaderGUI(tk.Tk):
             messagebox.showwarning("入力不足", "保存先フォルダを指定してください")
             return
         
-        self.settings["last_outdir"] = outdir_base
-        save_settings(self.settings)
+        self._set_setting("last_outdir", outdir_base)
 
-        if self.worker and self.worker.is_alive():
+        if self.pool is not None:
             messagebox.showinfo("実行中", "現在処理中です")
             return
 
         # 事前チェック
         console_log("==== 事前チェック開始 ====")
+        # URLごとに isdir を呼ばず、保存先の既存フォルダ名を1回の走査で集めておく
+        try:
+            with os.scandir(outdir_base) as it:
+                existing_names = {os.path.normcase(e.name) for e in it if e.is_dir()}
+        except OSError:
+            existing_names = set()
+        # URLの解析は1件につきここで1回だけ行い、結果をタスクへ渡す
+        infos = [parse_url_info(url, outdir_base) for url in lines]
         existing_list = []
-        for i, url in enumerate(lines, 1):
-            savedir = derive_savedir_from_url(url, outdir_base)
-            if os.path.isdir(savedir):
-                existing_list.append(savedir)
-                console_log(f"  [WARN] 既存フォルダ検知: {os.path.basename(savedir)}")
+        # 保存先フォルダ -> [(タスク番号, UrlInfo), ...]。同じフォルダに書くタスクは並行させず順番に実行する
+        groups: dict[str, list[tuple[int, UrlInfo]]] = {}
+        for idx, info in enumerate(infos, 1):
+            name = info.savedir.name
+            group = groups.setdefault(os.path.normcase(str(info.savedir)), [])
+            group.append((idx, info))
+            if len(group) > 1:
+                console_log(f"  [WARN] 保存先の重複: {name} ({len(group)} 件目)")
+            elif os.path.normcase(name) in existing_names:
+                existing_list.append(info.savedir)
+                console_log(f"  [WARN] 既存フォルダ検知: {name}")
             else:
-                console_log(f"  [OK] 新規作成予定: {os.path.basename(savedir)}")
-
-        if existing_list:
-            count = len(existing_list)
-            display_list = existing_list[:10]
-            msg_txt = "\n".join([os.path.basename(p) for p in display_list])
+                console_log(f"  [OK] 新規作成予定: {name}")
+        duplicate_list = [group[0][1].savedir for group in groups.values() if len(group) > 1]
+
+        messages = []
+        for paths, label in ((existing_list, "件のフォルダが既に存在します。"),
+                             (duplicate_list, "件のフォルダに複数のURLが保存されます (順番に処理します)。")):
+            if not paths:
+                continue
+            count = len(paths)
+            msg_txt = "\n".join(p.name for p in paths[:10])
             if count > 10:
                 msg_txt += f"\n... 他 {count - 10} 件"
-            proceed = messagebox.askyesno(
-                "確認", f"{count} 件のフォルダが既に存在します。続行しますか？\n\n{msg_txt}"
-            )
+            messages.append(f"{count} {label}\n{msg_txt}")
+        if messages:
+            proceed = messagebox.askyesno("確認", "\n\n".join(messages) + "\n\n続行しますか？")
             if not proceed:
                 console_log("ユーザーキャンセルにより中止")
                 return
 
-        self.url_queue = lines
-        self.total_tasks = len(lines)
-        self.current_task_idx = 0
-        self.btn_start.configure(state="disabled")
-        
-        console_log(f"==== 一括ダウンロード開始 (全 {self.total_tasks} 件) ====")
-        self.start_next_download()
-
-    def start_next_download(self):
-        if not self.url_queue:
-            console_log("==== 全タスク完了 ====")
-            self.var_status.set("全タスク完了")
-            self.pb.configure(value=100)
-            self.btn_start.configure(state="normal")
-            return
-
-        url = self.url_queue.pop(0)
-        self.current_task_idx += 1
-        outdir_base = self.var_outdir.get().strip()
-        savedir = derive_savedir_from_url(url, outdir_base)
-        os.makedirs(savedir, exist_ok=True)
+        try:
+            concurrency = min(max(int(self.var_concurrency.get()), 1), MAX_CONCURRENCY)
+        except (tk.TclError, ValueError):
+            concurrency = DEFAULT_CONCURRENCY
+        self._set_setting("concurrency", concurrency)
 
+        self.total_tasks = len(lines)
+        self.completed_tasks = 0
+        self.task_progress = {}
+        self.task_speed = {}
+        self._last_step = None
+        self._throttled = False
+        self._cookie_dir = Path(tempfile.mkdtemp(prefix="ytd_cookies_"))
+        self._cookie_file = None
+        self._cookie_exported = False
         self.pb.configure(value=0)
-        self.var_status.set(f"[{self.current_task_idx}/{self.total_tasks}] 初期化中...")
+        self.var_status.set(f"[0/{self.total_tasks}] 初期化中...")
+        self.btn_start.configure(state="disabled")
         
-        console_log(f"\n--- [Task {self.current_task_idx}/{self.total_tasks}] Start ---")
-        console_log(f"  URL: {url}")
-        console_log(f"  Dir: {savedir}")
+        console_log(f"==== 一括ダウンロード開始 (全 {self.total_tasks} 件, 同時 {min(concurrency, self.total_tasks)} 件) ====")
 
+        # Tk変数はワーカーから読まないよう、ここで値を確定させて渡す
         content = self.var_content.get()
         want_thumb = self.var_thumb.get()
         extra_audio = self.var_extra_audio.get()
+        post_extract = self.var_post_extract.get()
+
+        # 実際の同時実行数は limiter で絞り、転送速度を見ながら _adjust_concurrency で増減させる
+        self.limiter = _ConcurrencyLimiter(concurrency)
+        self._task_done = {idx: threading.Event() for idx in range(1, self.total_tasks + 1)}
+        self.pool = ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(groups)))
+        for tasks in groups.values():
+            if len(tasks) == 1:
+                idx, info = tasks[0]
+                self.pool.submit(self._run_one, idx, info, content, want_thumb, extra_audio, post_extract)
+            else:
+                self.pool.submit(self._run_chain, tasks, content, want_thumb, extra_audio, post_extract)
+        self.after(CONCURRENCY_ADJUST_MS, self._adjust_concurrency)
+        if not self._polling:
+            self._polling = True
+            self.after(EVENT_POLL_MS, self.process_events)
+
+    def _run_one(self, idx, info: UrlInfo, content, want_thumb, extra_audio, post_extract):
+        """1件分のタスク (ダウンロード + メタデータ保存)。プールのワーカースレッドで実行される"""
+        console_log(f"\n--- [Task {idx}/{self.total_tasks}] Start ---")
+        console_log(f"  URL: {info.url}")
+        console_log(f"  Dir: {info.savedir}")
+        try:
+            with self.limiter:
+                os.makedirs(info.savedir, exist_ok=True)
+                self.download_worker_cli(idx, info, content, want_thumb, extra_audio, post_extract)
+        except Exception as e:
+            console_log(f"  [Error] タスク例外: {e}")
+            self.events.put(("error", str(e)))
+            self.events.put(("done", {"idx": idx, "outdir": info.savedir, "is_ragtag": info.is_ragtag, "error": True}))
 
-        # JSON取得（CLI実行）
-        threading.Thread(target=self._run_json_dump, args=(url, savedir), daemon=True).start()
+    def _run_chain(self, tasks, content, want_thumb, extra_audio, post_extract):
+        """保存先フォルダが同じタスクを、前のタスクの事後処理が終わってから1件ずつ実行する"""
+        for idx, info in tasks:
+            if self._closing.is_set():
+                return
+            self._run_one(idx, info, content, want_thumb, extra_audio, post_extract)
+            self._task_done[idx].wait()
+
+    def _finish_task(self, idx):
+        """1件のタスクが(事後処理まで)完了した。全件終わったら後片付けする (メインスレッド)"""
+        self._task_done[idx].set()
+        self.completed_tasks += 1
+        self.task_progress[idx] = 100.0
+        self.pb.configure(value=sum(self.task_progress.values()) / self.total_tasks)
+        self.var_status.set(f"[{self.completed_tasks}/{self.total_tasks}] 完了")
+        if self.completed_tasks < self.total_tasks:
+            return
 
-        # ダウンロードワーカー起動
-        self.worker = threading.Thread(
-            target=self.download_worker_cli,
-            args=(url, savedir, content, want_thumb, extra_audio),
-            daemon=True,
-        )
-        self.worker.start()
+        console_log("==== 全タスク完了 ====")
+        self.var_status.set("全タスク完了")
+        self.pb.configure(value=100)
+        self.btn_start.configure(state="normal")
+        self.pool.shutdown(wait=False)
+        self.pool = None
+        self.limiter = None
+        shutil.rmtree(self._cookie_dir, ignore_errors=True)
+        self._cookie_dir = None
+
+    def _adjust_concurrency(self):
+        """全体スループットを見て同時実行数を1つずつ増減する (メインスレッド, 定期実行)"""
+        if self.pool is None or self.limiter is None:
+            return
+        limit = self.limiter.limit
+        throughput = sum(self.task_speed.values())
+        new_limit = limit
+
+        if self._throttled:
+            # HTTP 429 が出たらサーバー側の制限なので減らす
+            new_limit = max(1, limit - 1)
+        elif self._last_step and limit > self._last_step[0] and throughput < self._last_step[1] * CONCURRENCY_MIN_GAIN:
+            # 前回増やしたのにスループットが伸びていなければ元に戻す
+            new_limit = max(1, limit - 1)
+        elif self.limiter.waiting and self.limiter.active >= limit and limit < MAX_CONCURRENCY:
+            # 待ちタスクがあり、全枠が埋まっていれば1つ増やして様子を見る
+            new_limit = limit + 1
+
+        if new_limit != limit:
+            console_log(f"  [Concurrency] {limit} -> {new_limit} (合計 {throughput / 1024 ** 2:.2f} MiB/s)")
+            self.limiter.set_limit(new_limit)
+        self._last_step = (limit, throughput)
+        self._throttled = False
+        self.after(CONCURRENCY_ADJUST_MS, self._adjust_concurrency)
 
     # ---------- Worker (CLI Call) ----------
-    def _run_json_dump(self, url, savedir):
-        """メタデータを --dump-json で取得して保存"""
-        console_log("  [Step] メタデータ(JSON)取得中...")
-        cmd = ["yt-dlp", "--dump-json", "--skip-download", "--cookies-from-browser", "chrome", url]
+    def _cookie_args(self, idx):
+        """yt-dlp に渡す Cookie 指定。最初に呼んだワーカーがブラウザから1回だけ書き出す"""
+        with self._cookie_lock:
+            if not self._cookie_exported and self._cookie_dir is not None:
+                self._cookie_exported = True
+                path = self._cookie_dir / "cookies.txt"
+                console_log("  [Step] ブラウザ Cookie を書き出し中...")
+                if export_browser_cookies(path):
+                    self._cookie_file = path
+                else:
+                    console_log("  [Warn] Cookie の書き出しに失敗 (各 yt-dlp でブラウザから読み込みます)")
+            src = self._cookie_file
+        if src is None:
+            return ["--cookies-from-browser", COOKIE_BROWSER]
+        # yt-dlp は終了時に Cookie ファイルを書き戻すので、同時実行のプロセスごとに別ファイルを渡す
+        dst = src.with_name(f"cookies_{idx}.txt")
+        if not dst.exists():
+            shutil.copyfile(src, dst)
+        return ["--cookies", str(dst)]
+
+    def _store_video_info(self, outdir: Path):
+        """ダウンロード時に書き出された info.json を video_info.json として保存し、その内容を返す"""
+        src = outdir / "video_info.info.json"
         try:
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', startupinfo=startupinfo)
-            if proc.returncode == 0:
-                data = json.loads(proc.stdout)
-                with open(os.path.join(savedir, "video_info.json"), "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                self.events.put(("info", {"title": data.get("title", "")}))
-                console_log("  [Step] JSON保存完了")
-            else:
-                console_log("  [Step] JSON取得失敗 (Skip)")
+            with open(src, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with open(outdir / "video_info.json", "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.remove(src)
+            self.events.put(("info", {"title": data.get("title", "")}))
+            console_log("  [Step] JSON保存完了")
+            return data
+        except FileNotFoundError:
+            console_log("  [Step] JSON取得失敗 (Skip)")
         except Exception as e:
-            console_log(f"  [Error] JSON取得例外: {e}")
+            console_log(f"  [Error] JSON保存例外: {e}")
 
-    def download_worker_cli(self, url, outdir, content, want_thumb, extra_audio):
-        parsed = urlparse(url)
-        is_ragtag = "ragtag" in (parsed.netloc or "")
+    def download_worker_cli(self, idx, info: UrlInfo, content, want_thumb, extra_audio, post_extract):
+        url, outdir, is_ragtag = info.url, info.savedir, info.is_ragtag
 
         console_log("  [Step] メインダウンロード開始 (yt-dlp)...")
 
         # ベースコマンド
         cmd = ["yt-dlp"]
-        cmd.extend(["-o", os.path.join(outdir, "%(title)s.%(ext)s")])
+        cmd.extend(["-o", str(outdir / "%(title)s.%(ext)s")])
+        cmd.extend(self._cookie_args(idx))
         cmd.extend([
-            "--cookies-from-browser", "chrome",
             "--retries", "20",
             "--fragment-retries", "50",
             "--file-access-retries", "10",
             "--extractor-retries", "10",
             "--retry-sleep", "2",
             "--newline",
+            "--progress-template", _PROGRESS_TEMPLATE,
             "--no-colors"
         ])
+        # メタデータ(JSON)は別プロセスで --dump-json せず、ダウンロードと同じプロセスで書き出す
+        cmd.extend([
+            "--write-info-json",
+            "--no-write-playlist-metafiles",
+            "-o", f"infojson:{outdir / 'video_info'}",
+        ])
 
         if not is_ragtag:
             cmd.append("--no-playlist")
@@ -479,33 +907,56 @@ class YTDLPDownloaderGUI(tk.Tk):
         cmd.append(url)
 
         # 実行とログ解析
-        success = self._run_and_monitor(cmd)
+        success = self._run_and_monitor(cmd, idx)
+        # ダウンロードに失敗してもメタデータが取れていれば保存する
+        video_info = self._store_video_info(outdir)
 
         if not success:
             console_log("  [Error] メインダウンロード失敗")
             self.events.put(("error", "yt-dlp コマンドがエラー終了しました"))
-            self.events.put(("done", {"outdir": outdir, "is_ragtag": is_ragtag, "error": True}))
+            self.events.put(("done", {"idx": idx, "outdir": outdir, "is_ragtag": is_ragtag, "error": True}))
             return
 
         console_log("  [Step] メインダウンロード完了")
 
+        early_extract = None
         # 追加オーディオ（動画モード時）
-        if content == "video" and extra_audio:
+        # 結合済みファイルに同じ bestaudio がそのまま入っていれば、事後処理の音声抽出で取り出せるので再ダウンロードしない
+        if content == "video" and extra_audio and post_extract and video_info \
+                and merged_audio_covers_bestaudio(video_info, outdir):
+            console_log("  [Step] 追加オーディオは結合済みファイルから抽出 (ダウンロード省略)")
+        elif content == "video" and extra_audio:
+            # 結合済みファイルからの音声抽出は追加オーディオの取得と重ねて進める (ragtag は両方そろってから結合するので対象外)。
+            # 追加オーディオも形式によっては抽出対象になる (vorbis の .webm -> .ogg など) ので、
+            # 先行分は今ある動画ファイルだけを対象にし、追加オーディオの分は取得後に抽出する
+            if post_extract and not is_ragtag:
+                early_targets = _media_files(outdir)
+                early_extract = threading.Thread(target=self._post_extract, args=(outdir, False, early_targets), daemon=True)
+                early_extract.start()
             console_log("  [Step] 追加オーディオトラック取得開始...")
             self.events.put(("note", "別途音声トラック取得中(CLI)..."))
             cmd2 = ["yt-dlp"]
-            cmd2.extend(["-o", os.path.join(outdir, "%(title)s [audio].%(ext)s")])
-            cmd2.extend(["--cookies-from-browser", "chrome", "--newline", "--no-colors"])
+            cmd2.extend(["-o", str(outdir / "%(title)s [audio].%(ext)s")])
+            cmd2.extend(self._cookie_args(idx))
+            cmd2.extend(["--newline", "--progress-template", _PROGRESS_TEMPLATE, "--no-colors"])
             cmd2.extend(["-f", "bestaudio[protocol!=m3u8][vcodec=none]/bestaudio[vcodec=none]"])
             if not is_ragtag:
                 cmd2.append("--no-playlist")
             cmd2.append(url)
-            self._run_and_monitor(cmd2)
+            self._run_and_monitor(cmd2, idx)
             console_log("  [Step] 追加オーディオ完了")
-
-        self.events.put(("done", {"outdir": outdir, "is_ragtag": is_ragtag, "error": False}))
-
-    def _run_and_monitor(self, cmd):
+            if early_extract:
+                early_extract.join()
+                done = set(early_targets)
+                added = [p for p in _media_files(outdir) if p not in done]
+                if added:
+                    self._post_extract(outdir, False, added)
+
+        # 事後処理の要否は開始時の設定で判断する (追加オーディオを省略したかどうかもそれに依存するため)
+        self.events.put(("done", {"idx": idx, "outdir": outdir, "is_ragtag": is_ragtag, "error": False,
+                                  "post_extract": post_extract, "post_extracted": early_extract is not None}))
+
+    def _run_and_monitor(self, cmd, idx):
         startupinfo = None
         if os.name == 'nt':
             startupinfo = subprocess.STARTUPINFO()
@@ -520,27 +971,42 @@ class YTDLPDownloaderGUI(tk.Tk):
                 encoding='utf-8',
                 errors='replace',
                 startupinfo=startupinfo,
-                bufsize=1
+                # 行単位の読み取りは TextIOWrapper が行うので、下のバッファは大きく取って read の回数を減らす
+                # (届いた分だけ返す read1 で読まれるため、バッファが埋まるまで待つことはない)
+                bufsize=PIPE_BUFSIZE
             )
-            re_prog = re.compile(r"\[download\]\s+(\d+(?:\.\d+)?)%")
-
+            # 進捗は 0.5% 以上進んだか 0.1 秒経ったときだけ送る (100% は必ず送る)
+            last_sent_pct = -1.0
+            last_sent_time = 0.0
             for line in process.stdout:
                 line = line.strip()
                 if not line:
                     continue
                 
-                m = re_prog.search(line)
-                if m:
+                if line.startswith(_PROGRESS_PREFIX):
+                    # "[progress] 取得済みバイト 総バイト 総バイト(推定) 速度(bytes/s)"
+                    _, done, total, estimate, speed = (line.split() + ["NA"] * 5)[:5]
                     try:
-                        pct = float(m.group(1))
-                        self.events.put(("progress", pct))
-                    except:
-                        pass
+                        total_bytes = float(total if total != "NA" else estimate)
+                        pct = round(min(float(done) * 100.0 / total_bytes, 100.0), 1) if total_bytes else 0.0
+                    except ValueError:
+                        continue
+                    now = time.monotonic()
+                    if pct >= 100.0 or abs(pct - last_sent_pct) >= 0.5 or now - last_sent_time >= 0.1:
+                        try:
+                            speed = float(speed)
+                        except ValueError:
+                            speed = 0.0
+                        self.events.put(("progress", (idx, pct, speed)))
+                        last_sent_pct = pct
+                        last_sent_time = now
                 else:
                     # GUIには全部流さないが、コンソールにはエラーっぽいものだけ出す？
                     # ここでは全て流すと多すぎるので、ERRORだけprintする
                     if "ERROR" in line:
                         console_log(f"    (yt-dlp) {line}")
+                    if "HTTP Error 429" in line:
+                        self.events.put(("throttled", idx))
 
                     if line.startswith("[") and "download" not in line:
                         self.events.put(("log_line", line))
@@ -555,17 +1021,25 @@ class YTDLPDownloaderGUI(tk.Tk):
 
     # ---------- Event Loop ----------
     def process_events(self):
+        # 進捗はまとめて取り出した中の最新値だけを、最後に1回だけ画面へ反映する
+        latest_progress = None
         try:
             while True:
                 kind, payload = self.events.get_nowait()
                 if kind == "progress":
-                    self.pb.configure(value=payload)
-                    self.var_status.set(f"[{self.current_task_idx}/{self.total_tasks}] DL中... {payload}%")
+                    idx, pct, speed = payload
+                    self.task_progress[idx] = pct
+                    self.task_speed[idx] = speed
+                    latest_progress = (idx, pct)
+                elif kind == "throttled":
+                    self._throttled = True
                 elif kind == "log_line":
                     if len(payload) < 60:
                         self.var_status.set(payload)
+                        latest_progress = None
                 elif kind == "done":
                     self._handle_task_done(payload)
+                    latest_progress = None
                 elif kind == "error":
                     self._log(f"エラー: {payload}")
                 elif kind == "info":
@@ -575,50 +1049,80 @@ class YTDLPDownloaderGUI(tk.Tk):
                 elif kind == "post_extract_log":
                     self._log(str(payload))
                 elif kind == "post_extract_done":
-                    console_log("  [Step] タスク完了。次へ。")
-                    self.after(100, self.start_next_download)
+                    console_log(f"  [Step] タスク {payload['idx']} 完了")
+                    self._finish_task(payload["idx"])
+                    latest_progress = None
         except queue.Empty:
             pass
         finally:
-            self.after(100, self.process_events)
+            if self._pending_log:
+                self._flush_log()
+            if latest_progress is not None:
+                # 全体の進捗 = 各タスクの進捗の合計 / タスク数
+                idx, pct = latest_progress
+                self.pb.configure(value=sum(self.task_progress.values()) / self.total_tasks)
+                self.var_status.set(f"[{self.completed_tasks}/{self.total_tasks}] DL中... (#{idx}) {pct}%")
+            # 全タスクが終わり、残りのイベントも処理し終えたらポーリングを止める
+            if self.pool is not None or not self.events.empty():
+                self.after(EVENT_POLL_MS, self.process_events)
+            else:
+                self._polling = False
 
     def _handle_task_done(self, payload):
+        idx = payload.get("idx")
+        self.task_speed.pop(idx, None)  # ダウンロードが終わったタスクはスループットに数えない
         outdir = payload.get("outdir")
         is_ragtag = payload.get("is_ragtag")
         has_error = payload.get("error")
 
         if has_error:
             console_log("  [Warn] エラーのため事後処理をスキップ")
-            self.after(500, self.start_next_download)
+            self._finish_task(idx)
             return
 
-        if self.var_post_extract.get() and outdir:
+        if payload.get("post_extracted"):
+            console_log("  [Info] 事後処理はダウンロード中に実行済み")
+            self._finish_task(idx)
+        elif payload.get("post_extract") and outdir:
             console_log("  [Step] 事後処理スレッド起動 (FFmpeg)")
             threading.Thread(
                 target=self._post_extract_worker,
-                args=(Path(outdir), bool(is_ragtag)),
+                args=(idx, outdir, bool(is_ragtag)),
                 daemon=True,
             ).start()
         else:
             console_log("  [Info] 事後処理なし")
-            self.after(500, self.start_next_download)
+            self._finish_task(idx)
 
-    def _post_extract_worker(self, outdir, is_ragtag):
+    def _post_extract_worker(self, idx, outdir, is_ragtag):
+        try:
+            self._post_extract(outdir, is_ragtag)
+        finally:
+            self.events.put(("post_extract_done", {"idx": idx}))
+
+    def _post_extract(self, outdir, is_ragtag, targets=None):
+        """事後処理本体 (ragtag の結合 + 音声抽出)。ワーカースレッドで実行される"""
         def log_cb(s):
             self.events.put(("post_extract_log", s))
         try:
+            prewarm_probe_cache(outdir)
             if is_ragtag:
                 mux_ragtag_av(outdir, log_cb=log_cb)
-            extract_all_audios(outdir, log_cb=log_cb)
+            extract_all_audios(outdir, log_cb=log_cb, targets=targets)
         except Exception as e:
             console_log(f"  [Error] 事後処理例外: {e}")
             log_cb(f"事後処理エラー: {e}")
-        finally:
-            self.events.put(("post_extract_done", {}))
 
     def _log(self, text):
+        # 書き込みは process_events の最後に _flush_log でまとめて行う
+        self._pending_log.append(text)
+
+    def _flush_log(self):
+        lines, self._pending_log = self._pending_log, []
         self.txt_log.configure(state="normal")
-        self.txt_log.insert("end", text + "\n")
+        self.txt_log.insert("end", "\n".join(lines) + "\n")
+        if int(self.txt_log.index("end-1c").split(".")[0]) > LOG_MAX_LINES:
+            self.txt_log.delete("1.0", f"end -{LOG_MAX_LINES} lines")
         self.txt_log.see("end")
         self.txt_log.configure(state="disabled")
 
@@ -6,6 +6,8 @@ import threading
 import os
 import sys
 import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -13,6 +15,13 @@ from typing import Any, Dict, List, Optional
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+# JSONの高速な読み書き用（任意。なければ標準の json を使う）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
 # サムネイル表示用（任意）
 try:
     from PIL import Image, ImageTk
@@ -22,17 +31,62 @@ except Exception:
 
 IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
 
+# 検索欄の入力が止まってから絞り込みを実行するまでの待ち時間（ミリ秒）
+SEARCH_DEBOUNCE_MS = 180
+# 押しても検索文字列が変わらないキー（これらのキーを離しただけでは絞り込みをやり直さない）
+_NON_TEXT_KEYS = frozenset({
+    "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+    "Meta_L", "Meta_R", "Super_L", "Super_R", "Caps_Lock", "Num_Lock",
+    "Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next",
+    "Tab", "Escape", "Insert",
+})
+
+# デコード済みサムネイル (PhotoImage) を保持する件数
+THUMB_CACHE_SIZE = 128
+
+# Treeview に一度に追加する行数（末尾付近までスクロールしたら次の分を追加する）
+TREE_PAGE_SIZE = 500
+
+# スキャン時に各フォルダを並行して読むスレッド数の上限（I/O待ちが主なのでCPU数より多めに取る）
+SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 # 設定ファイル（最後に使ったフォルダAの保存先）
 CONFIG_PATH = Path.home() / ".video_browser_gui.json"
 
+# スキャン結果のキャッシュ（フォルダA直下に置く）。形式を変えたらバージョンを上げる
+SCAN_CACHE_NAME = ".video_browser_cache.json"
+SCAN_CACHE_VERSION = 2
+
+# 表示用に縮小したサムネイルの保存名（各フォルダ内）と大きさ
+THUMB_SIDECAR_NAME = ".thumb240.jpg"
+THUMB_SIZE = (240, 240)
+
+
+# ------------------ JSONの読み書き ------------------ #
+def read_json(path) -> Any:
+    """JSONファイル（str / Path）を読み込む。orjson があればそちらで解析する。"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: Path, data: Any) -> None:
+    """JSONファイルを書き出す（UTF-8、インデント2）。orjson があればそちらで整形する。"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
 
 # ------------------ 設定ファイルの読み書き ------------------ #
 def load_last_root() -> Optional[str]:
     """前回使ったフォルダAのパスを設定ファイルから読み込む。"""
     try:
         if CONFIG_PATH.exists():
-            with CONFIG_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(CONFIG_PATH)
             root = data.get("last_root")
             if isinstance(root, str) and root:
                 return root
@@ -42,29 +96,38 @@ def load_last_root() -> Optional[str]:
 
 
 def save_last_root(path: Path) -> None:
-    """フォルダAのパスを設定ファイルに保存する。"""
+    """フォルダAのパスを設定ファイルに保存する（前回と同じなら書き込まない）。"""
+    root = str(path)
+    if load_last_root() == root:
+        return
+    tmp = CONFIG_PATH.with_name(CONFIG_PATH.name + ".tmp")
     try:
-        data = {"last_root": str(path)}
-        with CONFIG_PATH.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        data = {"last_root": root}
+        # 一時ファイルに書いてから置き換え、書きかけの設定ファイルを残さない
+        write_json(tmp, data)
+        os.replace(tmp, CONFIG_PATH)
     except Exception:
         # 保存失敗しても致命的ではないので無視
         pass
 
 
 # ------------------ タグファイルの読み書き ------------------ #
-def load_tags_file(dirpath: Path) -> Optional[str]:
+def load_tags_file(dirpath) -> Optional[str]:
     """
     各フォルダ内の tags.json からタグを読み込む。
     形式: {"tags": ["tag1", "tag2", ...]}
     表示用には "tag1, tag2" のような文字列で返す。
     """
-    path = dirpath / "tags.json"
-    if not path.exists():
+    path = os.path.join(dirpath, "tags.json")
+    if not os.path.exists(path):
         return None
+    return _read_tags(path)
+
+
+def _read_tags(path) -> Optional[str]:
+    """存在が分かっている tags.json を読んで、表示用のタグ文字列にする。"""
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(path)
         tags = data.get("tags")
         if isinstance(tags, list):
             return ", ".join(str(t) for t in tags)
@@ -86,12 +149,23 @@ def save_tags_file(dirpath: Path, tags_str: str) -> None:
         if t:
             tags_list.append(t)
     data = {"tags": tags_list}
-    path = dirpath / "tags.json"
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json(dirpath / "tags.json", data)
 
 
 # ------------------ データ構造 ------------------ #
+# 検索対象として使う VideoRow のフィールド
+SEARCHABLE_FIELDS = (
+    "folder",
+    "title",
+    "tags",
+    "video_id",
+    "uploader",
+    "upload_date",
+    "webpage_url",
+    "info_timestamp",
+)
+
+
 @dataclass
 class VideoRow:
     folder: str
@@ -107,6 +181,27 @@ class VideoRow:
     webpage_url: Optional[str]
     info_timestamp: Optional[str]   # video_info.json の更新日時 "YYYY-MM-DD HH:MM:SS"
     has_llc_file: bool # LLCファイルの有無 (追加)
+    thumbnail_small: Optional[str] = None  # 表示用に縮小済みのサムネ（THUMB_SIDECAR_NAME）
+
+    def __post_init__(self):
+        self.refresh_search_index()
+        # Treeview に渡す値のタプル（GUI側で初回に作って保持する。行の内容を変えたら None に戻す）
+        self._values: Optional[tuple] = None
+        # 列ごとのソートキー（GUI側で初めてその列でソートしたときに作る）
+        self._sort_keys: Dict[str, Any] = {}
+
+    def refresh_search_index(self) -> None:
+        """
+        検索用に casefold した文字列を作っておく（dataclass のフィールドではないので出力には含まれない）。
+        タグなど検索対象の値を変更したら呼び直すこと。
+        """
+        by_field: Dict[str, str] = {}
+        for name in SEARCHABLE_FIELDS:
+            v = getattr(self, name)
+            by_field[name] = "" if v is None else str(v).casefold()
+        self._search_by_field = by_field
+        # 「すべて」用。列をまたいで一致しないよう、入力できない文字で区切る
+        self._search_all = "\0".join(self._search_by_field.values())
 
 
 # ------------------ ユーティリティ ------------------ #
@@ -126,20 +221,56 @@ def hhmmss(total_seconds: Optional[float]) -> Optional[str]:
 
 def pick_thumbnail(dirpath: Path) -> Optional[Path]:
     """フォルダ内のサムネ画像を1つ選ぶ。"""
+    with os.scandir(dirpath) as it:
+        entry = _pick_thumbnail([e for e in it if e.is_file()])
+    return Path(entry.path) if entry else None
+
+
+def _pick_thumbnail(files: List[os.DirEntry]) -> Optional[os.DirEntry]:
+    """scandir 済みのファイル一覧からサムネ画像を1つ選ぶ。"""
     priority = ["thumbnail", "thumb", "cover", "poster"]
-    files = [p for p in dirpath.iterdir()
-             if p.is_file() and p.suffix.lower() in IMAGE_EXTS]
-    if not files:
+    # 自前で作った縮小版は候補に入れない
+    images = [(os.path.splitext(e.name)[0].lower(), e) for e in files
+              if os.path.splitext(e.name)[1].lower() in IMAGE_EXTS and e.name != THUMB_SIDECAR_NAME]
+    if not images:
         return None
 
     # 優先名前から探す
     for base in priority:
-        for f in files:
-            if f.stem.lower().startswith(base):
-                return f
+        for stem, e in images:
+            if stem.startswith(base):
+                return e
 
-    # なければ更新日時が新しいもの
-    return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+    # なければ更新日時が新しいもの（stat は DirEntry にキャッシュされる）
+    return max((e for _, e in images), key=lambda e: e.stat().st_mtime)
+
+
+def make_thumbnail_sidecar(src: os.DirEntry, existing: Optional[os.DirEntry]) -> Optional[str]:
+    """
+    サムネ画像を THUMB_SIZE に縮小して同じフォルダに THUMB_SIDECAR_NAME として保存する。
+    既に元画像より新しい縮小版があればそのまま使う。作れなければ None。
+    """
+    dst = os.path.join(os.path.dirname(src.path), THUMB_SIDECAR_NAME)
+    if existing is not None and existing.stat().st_mtime >= src.stat().st_mtime:
+        return dst
+    if not PIL_AVAILABLE:
+        return None
+    tmp = dst + ".tmp"
+    try:
+        with Image.open(src.path) as img:
+            # JPEG は縮小しながらデコードさせる
+            img.draft("RGB", THUMB_SIZE)
+            img.thumbnail(THUMB_SIZE)
+            img.convert("RGB").save(tmp, "JPEG", quality=85)
+        os.replace(tmp, dst)
+        return dst
+    except Exception:
+        # 書き込めないフォルダや壊れた画像では元画像をそのまま表示する
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return None
 
 
 def parse_video_info(info: Dict[str, Any]) -> Dict[str, Any]:
@@ -167,83 +298,177 @@ def parse_video_info(info: Dict[str, Any]) -> Dict[str, Any]:
     return vid
 
 
-def load_video_info(json_path: Path) -> Optional[Dict[str, Any]]:
+def load_video_info(json_path) -> Optional[Dict[str, Any]]:
     try:
-        with json_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(json_path)
     except Exception:
         return None
 
 
+def _process_child(child: str) -> VideoRow:
+    """
+    フォルダA直下のフォルダ1つ分の VideoRow を作る。
+    フォルダ数ぶん呼ばれるので、パスは Path を作らず str のまま扱う。
+    """
+    # フォルダ内は1回だけ走査し、JSON・LLC・サムネの判定はこの一覧から行う
+    with os.scandir(child) as it:
+        files = [e for e in it if e.is_file()]
+    by_name = {os.path.normcase(e.name): e for e in files}
+
+    info_entry = by_name.get(os.path.normcase("video_info.json"))
+    info_raw = load_video_info(info_entry.path) if info_entry else None
+
+    # JSONファイルの更新日時
+    timestamp = None
+    if info_entry:
+        t = info_entry.stat().st_mtime
+        timestamp = datetime.datetime.fromtimestamp(t).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+    # LLCファイルの存在チェック
+    # フォルダ直下に .llc ファイルがあるかを確認
+    has_llc_file = any(os.path.splitext(e.name)[1].lower() == ".llc" for e in files)
+
+
+    if info_raw:
+        parsed = parse_video_info(info_raw)
+        duration = hhmmss(parsed.get("duration_sec"))
+        has_info = True
+        title = parsed.get("title")
+        video_id = parsed.get("video_id")
+        best_height = parsed.get("best_height")
+        uploader = parsed.get("uploader")
+        upload_date = parsed.get("upload_date")
+        webpage_url = parsed.get("webpage_url")
+    else:
+        has_info = False
+        title = None
+        video_id = None
+        duration = None
+        best_height = None
+        uploader = None
+        upload_date = None
+        webpage_url = None
+
+    thumb = _pick_thumbnail(files)
+    # 選択のたびに大きな画像をデコードしないよう、スキャン時に縮小版を用意しておく
+    thumb_small = None
+    if thumb:
+        thumb_small = make_thumbnail_sidecar(thumb, by_name.get(os.path.normcase(THUMB_SIDECAR_NAME)))
+
+    # タグ読み込み（有無はフォルダの一覧で分かるので、存在確認の stat はしない）
+    tags_entry = by_name.get(os.path.normcase("tags.json"))
+    tags_str = _read_tags(tags_entry.path) if tags_entry else None
+
+    return VideoRow(
+        folder=os.path.basename(child),
+        has_video_info=has_info,
+        title=title,
+        tags=tags_str,
+        video_id=video_id,
+        duration=duration,
+        best_height=best_height,
+        thumbnail=thumb.path if thumb else None,
+        uploader=uploader,
+        upload_date=upload_date,
+        webpage_url=webpage_url,
+        info_timestamp=timestamp,
+        has_llc_file=has_llc_file,
+        thumbnail_small=thumb_small,
+    )
+
+
+# ------------------ スキャン結果のキャッシュ ------------------ #
+def load_scan_cache(root: Path) -> Dict[str, Any]:
+    """前回のスキャン結果 {フォルダ名: {"key": [...], "row": {...}}} を読み込む。"""
+    try:
+        data = read_json(root / SCAN_CACHE_NAME)
+        if data.get("version") == SCAN_CACHE_VERSION and isinstance(data.get("entries"), dict):
+            return data["entries"]
+    except Exception:
+        pass
+    return {}
+
+
+def save_scan_cache(root: Path, entries: Dict[str, Any]) -> None:
+    """スキャン結果を一時ファイル経由で書き出す（途中で落ちても壊れたキャッシュを残さない）。"""
+    path = root / SCAN_CACHE_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        write_json(tmp, {"version": SCAN_CACHE_VERSION, "entries": entries})
+        os.replace(tmp, path)
+    except Exception:
+        # 書き込めないフォルダでも一覧表示はできるので無視
+        pass
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _child_key(child: str, thumbnail: Optional[str]) -> List[int]:
+    """
+    フォルダの内容が変わったかを判定するキー。
+    フォルダ自体の更新日時（ファイルの追加・削除・改名で変わる）と、
+    video_info.json / tags.json / 採用したサムネ画像の更新日時（上書き保存で変わる）を使う。
+    """
+    return [
+        _mtime_ns(child),
+        _mtime_ns(os.path.join(child, "video_info.json")),
+        _mtime_ns(os.path.join(child, "tags.json")),
+        _mtime_ns(thumbnail) if thumbnail else 0,
+    ]
+
+
+def _scan_child(child: str, cache: Dict[str, Any]):
+    """キャッシュが使えればそれを、使えなければフォルダを読んで (VideoRow, キー) を返す。"""
+    hit = cache.get(os.path.basename(child))
+    if hit:
+        try:
+            row = VideoRow(**hit["row"])
+        except Exception:
+            row = None
+        # サムネが差し替えられたり消えたり（フォルダAごと移動した場合など）していればキーが変わるので読み直す
+        if row:
+            key = _child_key(child, row.thumbnail)
+            if hit.get("key") == key:
+                return row, key
+    row = _process_child(child)
+    # 縮小版サムネを書き出すとフォルダの更新日時が変わるので、キーは読み終えてから取り直す
+    return row, _child_key(child, row.thumbnail)
+
+
 def collect_rows(root: Path, on_progress=None) -> List[VideoRow]:
     """フォルダA直下の各フォルダから VideoRow を作る。"""
-    rows: List[VideoRow] = []
-    children = [c for c in sorted(root.iterdir()) if c.is_dir()]
+    with os.scandir(root) as it:
+        children = [e.path for e in sorted(
+            (e for e in it if e.is_dir()), key=lambda e: os.path.normcase(e.name)
+        )]
     total = len(children)
+    if not children:
+        return []
 
-    for idx, child in enumerate(children, start=1):
-        info_path = child / "video_info.json"
-        info_raw = load_video_info(info_path)
-
-        # JSONファイルの更新日時
-        timestamp = None
-        if info_path.exists():
-            t = info_path.stat().st_mtime
-            timestamp = datetime.datetime.fromtimestamp(t).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-        
-        # LLCファイルの存在チェック
-        # フォルダ直下に .llc ファイルがあるかを確認
-        has_llc_file = any(p.suffix.lower() == ".llc" for p in child.iterdir() if p.is_file())
-
-
-        if info_raw:
-            parsed = parse_video_info(info_raw)
-            duration = hhmmss(parsed.get("duration_sec"))
-            has_info = True
-            title = parsed.get("title")
-            video_id = parsed.get("video_id")
-            best_height = parsed.get("best_height")
-            uploader = parsed.get("uploader")
-            upload_date = parsed.get("upload_date")
-            webpage_url = parsed.get("webpage_url")
-        else:
-            has_info = False
-            title = None
-            video_id = None
-            duration = None
-            best_height = None
-            uploader = None
-            upload_date = None
-            webpage_url = None
-
-        thumb = pick_thumbnail(child)
-
-        # タグ読み込み
-        tags_str = load_tags_file(child)
-
-        rows.append(
-            VideoRow(
-                folder=child.name,
-                has_video_info=has_info,
-                title=title,
-                tags=tags_str,
-                video_id=video_id,
-                duration=duration,
-                best_height=best_height,
-                thumbnail=str(thumb) if thumb else None,
-                uploader=uploader,
-                upload_date=upload_date,
-                webpage_url=webpage_url,
-                info_timestamp=timestamp,
-                has_llc_file=has_llc_file,
-            )
-        )
-
-        if on_progress:
-            on_progress(idx, total)
+    # 前回から変わっていないフォルダはキャッシュから作り、JSONの解析やフォルダの走査を省く
+    cache = load_scan_cache(root)
+    entries: Dict[str, Any] = {}
 
+    # 各フォルダの処理はほぼファイルI/O待ちなので、スレッドで並行させて待ち時間を重ねる。
+    # map は入力順に結果を返すので、並び順はこれまでと同じ。
+    rows: List[VideoRow] = []
+    with ThreadPoolExecutor(max_workers=min(SCAN_MAX_WORKERS, total)) as pool:
+        results = pool.map(lambda c: _scan_child(c, cache), children)
+        for idx, (row, key) in enumerate(results, start=1):
+            rows.append(row)
+            entries[row.folder] = {"key": key, "row": asdict(row)}
+            if on_progress:
+                on_progress(idx, total)
+
+    if entries != cache:
+        save_scan_cache(root, entries)
     return rows
 
 
@@ -265,16 +490,7 @@ class VideoBrowserGUI(ttk.Frame):
     )
 
     # 検索対象として使う内部キー
-    SEARCHABLE_COLUMNS = (
-        "folder",
-        "title",
-        "tags",
-        "video_id",
-        "uploader",
-        "upload_date",
-        "webpage_url",
-        "info_timestamp",
-    )
+    SEARCHABLE_COLUMNS = SEARCHABLE_FIELDS
 
     # GUIに表示する日本語 → 内部キー の対応
     SEARCH_LABEL_MAP = {
@@ -296,8 +512,15 @@ class VideoBrowserGUI(ttk.Frame):
         self.root_dir: Optional[Path] = None
         self.rows: List[VideoRow] = []       # 全件
         self.view_rows: List[VideoRow] = []  # フィルタ・ソート後の表示用
+        self._rows_by_folder: Dict[str, VideoRow] = {}  # フォルダ名（= Tree の iid）-> 行
 
+        self._tree_filled = 0  # view_rows のうち Treeview に挿入済みの件数
+        self._filter_after_id: Optional[str] = None  # 予約中の絞り込み（入力の間引き用）
+        # 直前の絞り込み (対象列, 検索文字列, 一致した行)。文字を打ち足したときはこの中だけを見る
+        self._last_filter: Optional[tuple] = None
         self._thumb_cache: Dict[str, Any] = {}
+        # (パス, 更新時刻) -> PhotoImage。同じ行を選び直したときに画像をデコードし直さない（古いものから捨てる）
+        self._thumb_images: "OrderedDict[tuple, Any]" = OrderedDict()
         self._sort_state: Dict[str, bool] = {}  # 列ごとの昇順/降順
 
         # 先に前回のフォルダを読み込んでおく
@@ -342,8 +565,8 @@ class VideoBrowserGUI(ttk.Frame):
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(sbar, textvariable=self.search_var, width=40)
         self.search_entry.pack(side=tk.LEFT, padx=6)
-        # 入力のたびに絞り込み
-        self.search_entry.bind("<KeyRelease>", lambda e: self.apply_filter())
+        # 入力が少し止まったら絞り込み（連続入力中は1回にまとめる）
+        self.search_entry.bind("<KeyRelease>", self._schedule_filter)
 
         ttk.Label(sbar, text="対象:").pack(side=tk.LEFT, padx=(10, 0))
         self.search_target = ttk.Combobox(
@@ -376,7 +599,8 @@ class VideoBrowserGUI(ttk.Frame):
         # スクロールバー
         vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree_vsb = vsb
+        self.tree.configure(yscrollcommand=self._on_tree_scroll, xscrollcommand=hsb.set)
 
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
@@ -458,8 +682,11 @@ class VideoBrowserGUI(ttk.Frame):
 
     # ---------- 共通ヘルパー ---------- #
     def _row_to_values(self, r: VideoRow):
+        # 値は行の内容が変わらない限り同じなので、作ったタプルを行に持たせて使い回す
+        if r._values is not None:
+            return r._values
         llc_display = "○" if r.has_llc_file else ""
-        return (
+        r._values = (
             r.folder,
             r.title or "",
             r.tags or "",
@@ -472,52 +699,85 @@ class VideoBrowserGUI(ttk.Frame):
             r.webpage_url or "",
             r.info_timestamp or "",
         )
+        return r._values
 
     def refresh_tree(self):
-        """view_rows の内容で Treeview を再描画。"""
+        """view_rows の内容で Treeview を再描画。行は先頭の1ページ分だけ挿入し、残りはスクロールに応じて追加する。"""
         self.tree.delete(*self.tree.get_children())
-        for r in self.view_rows:
+        self._tree_filled = 0
+        self._extend_tree(TREE_PAGE_SIZE)
+
+    def _extend_tree(self, upto: int):
+        """Treeview に view_rows の先頭から upto 件目までが入るよう、未挿入の分を追加する。"""
+        upto = min(upto, len(self.view_rows))
+        for r in self.view_rows[self._tree_filled:upto]:
             self.tree.insert("", tk.END, iid=r.folder, values=self._row_to_values(r))
+        self._tree_filled = max(self._tree_filled, upto)
+
+    def _on_tree_scroll(self, first, last):
+        self.tree_vsb.set(first, last)
+        # 表示範囲が末尾付近に達したら次のページを追加する
+        if float(last) >= 0.9 and self._tree_filled < len(self.view_rows):
+            self._extend_tree(self._tree_filled + TREE_PAGE_SIZE)
 
     # ---------- フィルタ（検索）関連 ---------- #
+    def _schedule_filter(self, event=None):
+        if event is not None and event.keysym in _NON_TEXT_KEYS:
+            return
+        self._cancel_scheduled_filter()
+        self._filter_after_id = self.after(SEARCH_DEBOUNCE_MS, self.apply_filter)
+
+    def _cancel_scheduled_filter(self):
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+            self._filter_after_id = None
+
     def apply_filter(self):
-        query = (self.search_var.get() or "").strip().lower()
+        # 予約中の絞り込みがあれば、ここで実行するので取り消す
+        self._cancel_scheduled_filter()
+
+        # 行側の検索用文字列と同じく casefold で揃える（ß と ss なども一致させる）
+        query = (self.search_var.get() or "").strip().casefold()
         target_label = self.search_target.get()
 
         if not query:
             # 検索文字列が空なら全件表示（現在の self.rows の並びを尊重）
+            self._last_filter = None
             self.view_rows = list(self.rows)
             self.refresh_tree()
             return
 
         # 対象列の内部キー（見つからなければ ALL 扱い）
         target = self.SEARCH_LABEL_MAP.get(target_label)
-
-        def match(r: VideoRow) -> bool:
-            def field_text(name: str) -> str:
-                v = getattr(r, name, "")
-                return ("" if v is None else str(v)).lower()
-
+        if target_label == "すべて" or target is None:
+            target = None
+
+        # 今回の文字列が前回の文字列を含むなら、一致する行は前回の一致行の中にしかない。
+        # 入力中は1文字ずつ打ち足していくので、2文字目以降は候補がどんどん小さくなる。
+        candidates = self.rows
+        last = self._last_filter
+        if last is not None and last[0] == target and last[1] in query:
+            candidates = last[2]
+
+        # 各行の検索用文字列は VideoRow 作成時に用意してあるので、ここでは部分一致を見るだけ
+        if target is None:
             # 「すべて」のときは SEARCHABLE_COLUMNS 全部
-            if target_label == "すべて" or target is None:
-                for name in self.SEARCHABLE_COLUMNS:
-                    if query in field_text(name):
-                        return True
-                return False
-            else:
-                return query in field_text(target)
-
-        self.view_rows = [r for r in self.rows if match(r)]
+            matched = [r for r in candidates if query in r._search_all]
+        else:
+            matched = [r for r in candidates if query in r._search_by_field[target]]
+        self._last_filter = (target, query, matched)
+        # 列ソートで view_rows が並べ替えられても、候補側の並び（self.rows 順）は崩さない
+        self.view_rows = list(matched)
         self.refresh_tree()
 
     def clear_filter(self):
         """検索条件をクリアして、JSON更新日時の新しい順に戻す。"""
+        self._cancel_scheduled_filter()
         self.search_var.set("")
         self.search_target.current(0)
 
-        # クリア時も JSON更新日時で降順ソート（新しいものが上）
-        self.rows.sort(key=lambda r: r.info_timestamp or "", reverse=True)
-
+        # self.rows はスキャン完了時に JSON更新日時の降順へ並べたまま
+        # （列ソートで並べ替えるのは view_rows だけ）なので、コピーすればその順に戻る
         self.view_rows = list(self.rows)
         self.refresh_tree()
 
@@ -528,7 +788,7 @@ class VideoBrowserGUI(ttk.Frame):
         reverse = self._sort_state.get(col, False)
         self._sort_state[col] = not reverse
 
-        def sort_key(r: VideoRow):
+        def make_key(r: VideoRow):
             val = getattr(r, col, None)
             if val is None:
                 return ""
@@ -544,7 +804,11 @@ class VideoBrowserGUI(ttk.Frame):
             
             return str(val).lower()
 
-        self.view_rows.sort(key=sort_key, reverse=reverse)
+        # キーは行ごと・列ごとに一度だけ作り、以降のソートでは使い回す
+        for r in self.view_rows:
+            if col not in r._sort_keys:
+                r._sort_keys[col] = make_key(r)
+        self.view_rows.sort(key=lambda r: r._sort_keys[col], reverse=reverse)
         self.refresh_tree()
 
     # ---------- アクション ---------- #
@@ -570,6 +834,8 @@ class VideoBrowserGUI(ttk.Frame):
         self.tree.delete(*self.tree.get_children())
         self.rows = []
         self.view_rows = []
+        self._rows_by_folder = {}
+        self._last_filter = None
         self.set_progress(0, 1)
 
         def _worker():
@@ -597,6 +863,8 @@ class VideoBrowserGUI(ttk.Frame):
         rows.sort(key=lambda r: r.info_timestamp or "", reverse=True)
 
         self.rows = rows
+        self._rows_by_folder = {r.folder: r for r in rows}
+        self._last_filter = None
         self.view_rows = list(rows)
         self.refresh_tree()
 
@@ -614,7 +882,7 @@ class VideoBrowserGUI(ttk.Frame):
         if not sel:
             return
         iid = sel[0]
-        row = next((r for r in self.rows if r.folder == iid), None)
+        row = self._rows_by_folder.get(iid)
         if not row:
             return
 
@@ -638,34 +906,45 @@ class VideoBrowserGUI(ttk.Frame):
         )
 
         self.tag_var.set(row.tags or "")
-        self.show_thumbnail(row.thumbnail)
+        small = row.thumbnail_small
+        self.show_thumbnail(small if small and os.path.exists(small) else row.thumbnail)
         self.open_folder_btn.configure(state=tk.NORMAL)
 
     def show_thumbnail(self, path_str: Optional[str]):
+        # 画像はキャッシュが参照を持ち続けるので、文字を出すときは表示中の画像を外す
         if not PIL_AVAILABLE:
-            self.thumb_label.configure(text="(Pillow未インストールのためプレビュー不可)")
+            self.thumb_label.configure(image="", text="(Pillow未インストールのためプレビュー不可)")
             self._thumb_cache.clear()
             return
 
         if not path_str:
-            self.thumb_label.configure(text="(サムネなし)")
+            self.thumb_label.configure(image="", text="(サムネなし)")
             self._thumb_cache.clear()
             return
 
-        p = Path(path_str)
-        if not p.exists():
-            self.thumb_label.configure(text="(画像ファイルが見つかりません)")
+        try:
+            st = os.stat(path_str)
+        except OSError:
+            self.thumb_label.configure(image="", text="(画像ファイルが見つかりません)")
             self._thumb_cache.clear()
             return
 
         try:
-            img = Image.open(p)
-            img.thumbnail((240, 240))
-            tkimg = ImageTk.PhotoImage(img)
+            key = (path_str, st.st_mtime_ns)
+            tkimg = self._thumb_images.get(key)
+            if tkimg is not None:
+                self._thumb_images.move_to_end(key)
+            else:
+                img = Image.open(path_str)
+                img.thumbnail((240, 240))
+                tkimg = ImageTk.PhotoImage(img)
+                self._thumb_images[key] = tkimg
+                if len(self._thumb_images) > THUMB_CACHE_SIZE:
+                    self._thumb_images.popitem(last=False)
             self.thumb_label.configure(image=tkimg, text="")
             self._thumb_cache["thumb"] = tkimg
         except Exception as e:
-            self.thumb_label.configure(text=f"(表示失敗: {e})")
+            self.thumb_label.configure(image="", text=f"(表示失敗: {e})")
             self._thumb_cache.clear()
 
     def save_tag_for_selected(self):
@@ -684,13 +963,24 @@ class VideoBrowserGUI(ttk.Frame):
             messagebox.showerror("保存失敗", f"タグの保存に失敗しました:\n{e}")
             return
 
-        # rows / view_rows を更新
-        for r in self.rows:
-            if r.folder == folder_name:
-                r.tags = tags_str
-                break
+        # rows / view_rows を更新（行オブジェクトは共有なので辞書から引いて書き換えればよい）
+        r = self._rows_by_folder.get(folder_name)
+        if r:
+            r.tags = tags_str
+            r.refresh_search_index()
+            r._values = None
+            r._sort_keys.clear()
+        # 検索用文字列が変わったので、前回の絞り込み結果は使えない
+        self._last_filter = None
 
         self.refresh_tree()
+        # 再描画で先頭ページだけに戻るので、編集した行まで挿入し直して選択・表示位置を戻す
+        idx = next((i for i, v in enumerate(self.view_rows) if v.folder == folder_name), None)
+        if idx is not None:
+            self._extend_tree(idx + 1)
+            self.tree.selection_set(folder_name)
+            self.tree.focus(folder_name)
+            self.tree.see(folder_name)
         messagebox.showinfo("完了", "タグを保存しました。")
 
     def export_csv(self):
@@ -706,15 +996,16 @@ class VideoBrowserGUI(ttk.Frame):
             return
 
         keys = list(VideoRow.__annotations__.keys())
-        try:
+        rows = list(self.rows)
+
+        def _worker():
+            # asdict は行ごとに深いコピーを作るので、値は属性から直接タプルで取り出す
             with open(dst, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.DictWriter(f, fieldnames=keys)
-                writer.writeheader()
-                for r in self.rows:
-                    writer.writerow(asdict(r))
-            messagebox.showinfo("完了", f"CSVを書き出しました:\n{dst}")
-        except Exception as e:
-            messagebox.showerror("保存失敗", str(e))
+                writer = csv.writer(f)
+                writer.writerow(keys)
+                writer.writerows(tuple(getattr(r, k) for k in keys) for r in rows)
+
+        self._run_export(_worker, f"CSVを書き出しました:\n{dst}")
 
     def export_json(self):
         if not self.rows:
@@ -728,17 +1019,37 @@ class VideoBrowserGUI(ttk.Frame):
         if not dst:
             return
 
-        try:
-            with open(dst, "w", encoding="utf-8") as f:
-                json.dump(
-                    [asdict(r) for r in self.rows],
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                )
-            messagebox.showinfo("完了", f"JSONを書き出しました:\n{dst}")
-        except Exception as e:
-            messagebox.showerror("保存失敗", str(e))
+        keys = list(VideoRow.__annotations__.keys())
+        rows = list(self.rows)
+
+        def _worker():
+            write_json(Path(dst), [{k: getattr(r, k) for k in keys} for r in rows])
+
+        self._run_export(_worker, f"JSONを書き出しました:\n{dst}")
+
+    def _run_export(self, work, done_msg: str):
+        """書き出し処理 work をスレッドで実行し、終わったらメインスレッドで結果を表示する。"""
+        self.export_csv_btn.configure(state=tk.DISABLED)
+        self.export_json_btn.configure(state=tk.DISABLED)
+
+        def _finish(error: Optional[Exception]):
+            state = tk.NORMAL if self.rows else tk.DISABLED
+            self.export_csv_btn.configure(state=state)
+            self.export_json_btn.configure(state=state)
+            if error is None:
+                messagebox.showinfo("完了", done_msg)
+            else:
+                messagebox.showerror("保存失敗", str(error))
+
+        def _worker():
+            try:
+                work()
+                error = None
+            except Exception as e:
+                error = e
+            self.master.after(0, lambda: _finish(error))
+
+        threading.Thread(target=_worker, daemon=True).start()
 
     def open_selected_folder(self):
         sel = self.tree.selection()